@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from datetime import datetime
+from typing import Optional, Dict, Any
+from .log_normalizer import normalize_log
+
+logger=logging.getLogger("AnalysisCache")
+
+DEFAULT_ANALYSIS_CACHE_PATH=".agent_state/analysis_cache.db"
+DEFAULT_ANALYSIS_CACHE_TTL=7*24*3600
+DEFAULT_ANALYSIS_CACHE_MAX_ENTRIES=20_000
+
+# fields describing one run rather than the failure itself; never served from the cache
+RUN_FIELDS=("analyzed_at","run_id","run_number","generation","signature")
+
+def make_key(model:str,prompt_version:str,excerpt:str)->str:
+    return hashlib.sha256(f"{model}\0{prompt_version}\0{normalize_log(excerpt)}".encode("utf-8")).hexdigest()
+
+class AnalysisCache:
+    """
+    Persistent cache of LLM failure analyses keyed by make_key(model, prompt
+    version, log excerpt).
+
+    Entries expire after ttl seconds; beyond max_entries the least recently
+    used ones are evicted. A hit comes back marked cached=True with the time
+    and run it was first produced for, so its provenance stays visible.
+    """
+
+    def __init__(self,path:Optional[str]=None,ttl:Optional[float]=None,max_entries:Optional[int]=None):
+        self.path=path or os.getenv("ANALYSIS_CACHE_PATH",DEFAULT_ANALYSIS_CACHE_PATH)
+        self.ttl=ttl or float(os.getenv("ANALYSIS_CACHE_TTL",DEFAULT_ANALYSIS_CACHE_TTL))
+        self.max_entries=max_entries or int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES",DEFAULT_ANALYSIS_CACHE_MAX_ENTRIES))
+        directory=os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory,exist_ok=True)
+
+        self.hits=0
+        self.misses=0
+        self.expired=0
+        self.evictions=0
+
+        self._conn=sqlite3.connect(self.path)
+        # every hit writes last_access; WAL without a sync per commit keeps a lookup in the microseconds
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS analyses(
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                source_run_id INTEGER,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS analyses_last_access ON analyses(last_access);
+        """)
+        self._conn.commit()
+
+    def get(self,key:str)->Optional[Dict[str,Any]]:
+        row=self._conn.execute(
+            "SELECT analysis,source_run_id,created_at,hit_count FROM analyses WHERE key=?",(key,)
+        ).fetchone()
+        now=time.time()
+        if row is None:
+            self.misses+=1
+            return None
+
+        if now-row[2]>self.ttl:
+            with self._conn:
+                self._conn.execute("DELETE FROM analyses WHERE key=?",(key,))
+            self.expired+=1
+            self.misses+=1
+            return None
+
+        with self._conn:
+            self._conn.execute(
+                "UPDATE analyses SET last_access=?,hit_count=hit_count+1 WHERE key=?",(now,key)
+            )
+        self.hits+=1
+
+        analysis=json.loads(row[0])
+        analysis.update({
+            "cached":True,
+            "cache_key":key,
+            "cached_at":datetime.fromtimestamp(row[2]).isoformat(),
+            "cached_from_run_id":row[1],
+            "cache_hits":row[3]+1
+        })
+        return analysis
+
+    def put(self,key:str,analysis:Dict[str,Any],model:str)->None:
+        stored={field:value for field,value in analysis.items() if field not in RUN_FIELDS}
+        now=time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses(key,model,analysis,source_run_id,created_at,last_access) VALUES (?,?,?,?,?,?)",
+                (key,model,json.dumps(stored),analysis.get("run_id"),now,now)
+            )
+        self._evict(now)
+
+    def _evict(self,now:float)->None:
+        with self._conn:
+            self.expired+=self._conn.execute(
+                "DELETE FROM analyses WHERE created_at<?",(now-self.ttl,)
+            ).rowcount
+            excess=self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]-self.max_entries
+            if excess>0:
+                self._conn.execute(
+                    "DELETE FROM analyses WHERE key IN (SELECT key FROM analyses ORDER BY last_access LIMIT ?)",
+                    (excess,)
+                )
+                self.evictions+=excess
+                logger.debug(f"Evicted {excess} cached analyses")
+
+    def stats(self)->Dict[str,Any]:
+        entries=self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        lookups=self.hits+self.misses
+        return {
+            "entries":entries,
+            "max_entries":self.max_entries,
+            "ttl":self.ttl,
+            "hits":self.hits,
+            "misses":self.misses,
+            "expired":self.expired,
+            "evictions":self.evictions,
+            "hit_rate":self.hits/lookups if lookups else 0.0
+        }
+
+    def close(self)->None:
+        self._conn.close()
+
+_cache: Optional[AnalysisCache]=None
+
+def get_analysis_cache()->AnalysisCache:
+    global _cache
+
+    if _cache is None:
+        _cache=AnalysisCache()
+
+    return _cache
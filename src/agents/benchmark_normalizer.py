@@ -0,0 +1,63 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0,str(Path(__file__).parent.parent))
+
+from mcp_servers.workload import Workload
+from .log_normalizer import LogNormalizer,SignatureScanner
+
+CHUNK_SIZE=64*1024
+
+def build_corpus(target_mb:float,seed:int)->list:
+    """Failed job logs from the synthetic workload, with ANSI colour and ids mixed in, up to target_mb."""
+    workload=Workload(repos=5,runs_per_repo=100,failure_rate=0.5,noise_lines=400,seed=seed)
+    jobs=[job for job in workload.jobs_by_id.values() if job["conclusion"]=="failure"]
+    logs=[]
+    size=0
+    i=0
+    while size<target_mb*1024*1024:
+        job=jobs[i%len(jobs)]
+        text=workload.job_log(job).replace("##[error]","\x1b[31m##[error]",1)
+        text+=f"Cleaning up /tmp/runner-{job['id']}/work after 12.{i%97}s (job {job['id']}, port 5{i%1000:03d})\n"
+        logs.append(text)
+        size+=len(text)
+        i+=1
+    return logs
+
+def run_benchmark(args)->None:
+    logs=build_corpus(args.mb,args.seed)
+    total_chars=sum(len(log) for log in logs)
+    print(f"Corpus: {len(logs)} failed job logs, {total_chars/1024/1024:.1f} MB")
+
+    for collapse in (True,False):
+        lines_in=lines_out=0
+        fingerprints=set()
+        start=time.perf_counter()
+        for log in logs:
+            normalizer=LogNormalizer(collapse_repeats=collapse)
+            scanner=SignatureScanner()
+            for offset in range(0,len(log),CHUNK_SIZE):
+                for line in normalizer.feed(log[offset:offset+CHUNK_SIZE]):
+                    scanner.feed(line)
+            for line in normalizer.close():
+                scanner.feed(line)
+            fingerprints.add(scanner.signature()["fingerprint"])
+            lines_in+=normalizer.lines_in
+            lines_out+=normalizer.lines_out
+        elapsed=time.perf_counter()-start
+
+        mb=total_chars/1024/1024
+        print(
+            f"collapse_repeats={collapse!s:<5} {elapsed:6.2f}s  {mb/elapsed:7.1f} MB/s  {mb/elapsed*60:8.0f} MB/min  "
+            f"{lines_in/elapsed/1e6:5.2f}M lines/s  {lines_in} -> {lines_out} lines  {len(fingerprints)} distinct signatures"
+        )
+
+if __name__=="__main__":
+    parser=argparse.ArgumentParser(description="Single-core throughput of log normalization and failure signatures")
+    parser.add_argument("--mb",type=float,default=200,help="corpus size in MB")
+    parser.add_argument("--seed",type=int,default=0)
+    run_benchmark(parser.parse_args())
+
+#python -m src.agents.benchmark_normalizer --mb 500
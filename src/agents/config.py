@@ -1,32 +1,56 @@
+import asyncio
+import json
 import os
+import httpx
 import requests
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+
+try:
+    from .json_stream import JsonObjectScanner
+except ImportError:
+    from json_stream import JsonObjectScanner
 
 logger=logging.getLogger("OllamaConfig")
 
+OLLAMA_BASE_URL=os.getenv("OLLAMA_BASE_URL","http://localhost:11434")
+OLLAMA_TIMEOUT=float(os.getenv("OLLAMA_TIMEOUT","120"))
+OLLAMA_MAX_CONNECTIONS=int(os.getenv("OLLAMA_MAX_CONNECTIONS","4"))
+# match the Ollama server's OLLAMA_NUM_PARALLEL: more concurrent requests than that just queue server side
+OLLAMA_NUM_PARALLEL=int(os.getenv("OLLAMA_NUM_PARALLEL","2"))
+OLLAMA_STREAM=os.getenv("OLLAMA_STREAM","true").lower() in ("1","true","yes")
+
+def _options(kwargs:Dict[str,Any])->Dict[str,Any]:
+    return {
+        "temperature":kwargs.get("temperature",0.0),
+        "num_predict":kwargs.get("max_tokens",4096),
+    }
+
+def _check_models(model:str,tags:Dict[str,Any])->None:
+    model_names=[m.get("name") for m in tags.get("models",[])]
+    if model not in model_names:
+        logger.warning(f"Model {model} not found. Available models: {model_names}")
+        raise ValueError(
+            f"Model {model} not available. "
+        )
+    logger.info("Ollama server connected")
+
 class OllamaConfig:
+    """Blocking Ollama client for scripts; the graph nodes use AsyncOllamaClient."""
 
-    def __init__(self,base_url:str="http://localhost:11434",model:str="qwen2.5-coder:3b"):
+    def __init__(self,base_url:str=OLLAMA_BASE_URL,model:str="qwen2.5-coder:3b",timeout:float=OLLAMA_TIMEOUT):
         self.base_url=base_url.rstrip("/")
         self.model=model
+        self.timeout=timeout
+        self.session=requests.Session()
         self._verify_connection()
         logger.info(f"Ollama configuration initialized with model: {model}")
 
     def _verify_connection(self):
         try:
-            response=requests.get(f"{self.base_url}/api/tags",timeout=5)
+            response=self.session.get(f"{self.base_url}/api/tags",timeout=5)
             response.raise_for_status()
-
-            models=response.json().get("models",[])
-            model_names=[m.get("name") for m in models]
-
-            if self.model not in model_names:
-                logger.warning(f"Model {self.model} not found. Available models: {model_names}")
-                raise ValueError(
-                    f"Model {self.model} not available. "
-                )
-            logger.info("Ollama server connected")
+            _check_models(self.model,response.json())
         
         except requests.exceptions.ConnectionError:
             raise ConnectionError(
@@ -42,16 +66,13 @@ class OllamaConfig:
             "model":self.model,
             "prompt":prompt,
             "stream":False,
-            "options":{
-                "temperature":kwargs.get("temperature",0.0),
-                "nun_predict":kwargs.get("max_tokens",4096),
-            }
+            "options":_options(kwargs)
         }
         try:
-            response=requests.post(
+            response=self.session.post(
                 f"{self.base_url}/api/generate",
                 json=payload,
-                timeout=120
+                timeout=kwargs.get("timeout",self.timeout)
             )
             response.raise_for_status()
 
@@ -66,27 +87,169 @@ class OllamaConfig:
             "model":self.model,
             "messages":messages,
             "stream":False,
-            "options":{
-                "temperature":kwargs.get("temperature",0.0),
-                "num_perdict":kwargs.get("max_tokens",4096),
-            }
+            "options":_options(kwargs)
         }
         try:
-            response=requests.post(
+            response=self.session.post(
                 f"{self.base_url}/api/chat",
                 json=payload,
-                timeout=120
+                timeout=kwargs.get("timeout",self.timeout)
             )
             response.raise_for_status()
 
             result=response.json()
-            return result.get("messages",{}).get("content","")
+            return result.get("message",{}).get("content","")
         
         except requests.exceptions.RequestException as e:
             logger.error(f"Ollama chat failed: {e}")
             raise
 
+    def close(self)->None:
+        self.session.close()
+
+class AsyncOllamaClient:
+    """
+    Non-blocking Ollama client on a pooled httpx.AsyncClient.
+
+    Each call is bounded by its own timeout (asyncio.TimeoutError when it
+    expires) and can be cancelled; cancelling drops the connection, which makes
+    Ollama stop generating. The server is checked once, on first use.
+    """
+
+    def __init__(self,base_url:str=OLLAMA_BASE_URL,model:str="qwen2.5-coder:3b",timeout:float=OLLAMA_TIMEOUT,max_connections:int=OLLAMA_MAX_CONNECTIONS):
+        self.base_url=base_url.rstrip("/")
+        self.model=model
+        self.timeout=timeout
+        self.limits=httpx.Limits(max_connections=max_connections,max_keepalive_connections=max_connections)
+        self._client:Optional[httpx.AsyncClient]=None
+        self._verified=False
+
+    @property
+    def client(self)->httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            # the overall deadline is enforced per call with asyncio.wait_for
+            self._client=httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                timeout=httpx.Timeout(None,connect=5.0)
+            )
+        return self._client
+
+    async def verify(self)->None:
+        if self._verified:
+            return
+        try:
+            response=await asyncio.wait_for(self.client.get("/api/tags"),5)
+            response.raise_for_status()
+        except httpx.ConnectError:
+            raise ConnectionError(
+                "Can't connect to Ollama server. "
+                "Make sure Ollama is running:\n"
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError("Ollama server is not responding")
+        _check_models(self.model,response.json())
+        self._verified=True
+
+    async def _post(self,path:str,payload:Dict[str,Any],timeout:Optional[float])->Dict[str,Any]:
+        await self.verify()
+        response=await asyncio.wait_for(self.client.post(path,json=payload),timeout or self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def generate(self,prompt:str,timeout:Optional[float]=None,**kwargs)->str:
+        payload={
+            "model":self.model,
+            "prompt":prompt,
+            "stream":False,
+            "options":_options(kwargs)
+        }
+        try:
+            result=await self._post("/api/generate",payload,timeout)
+            return result.get("response","")
+        except (httpx.HTTPError,asyncio.TimeoutError) as e:
+            logger.error(f"Ollama generation failed: {e!r}")
+            raise
+
+    async def generate_json(self,prompt:str,timeout:Optional[float]=None,**kwargs)->Tuple[str,Dict[str,Any]]:
+        """
+        Stream a generation and stop as soon as a complete top-level JSON object
+        has arrived; closing the stream makes Ollama stop generating.
+
+        Returns (text, stats). text is the JSON object, or everything generated
+        if no complete object was produced. stats holds ttft (time to first
+        token), time_to_json, total seconds, tokens received and whether the
+        generation was stopped early.
+        """
+        payload={
+            "model":self.model,
+            "prompt":prompt,
+            "stream":True,
+            "options":_options(kwargs)
+        }
+        await self.verify()
+
+        loop=asyncio.get_running_loop()
+        started=loop.time()
+        stats={"ttft":None,"time_to_json":None,"total":None,"tokens":0,"stopped_early":False}
+        scanner=JsonObjectScanner()
+        generated=[]
+
+        async def stream()->str:
+            async with self.client.stream("POST","/api/generate",json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk=json.loads(line)
+                    token=chunk.get("response","")
+                    if token:
+                        if stats["ttft"] is None:
+                            stats["ttft"]=loop.time()-started
+                        stats["tokens"]+=1
+                        generated.append(token)
+                        obj=scanner.feed(token)
+                        if obj is not None:
+                            stats["time_to_json"]=loop.time()-started
+                            stats["stopped_early"]=not chunk.get("done",False)
+                            return obj
+                    if chunk.get("done"):
+                        break
+            return "".join(generated)
+
+        try:
+            text=await asyncio.wait_for(stream(),timeout or self.timeout)
+        except (httpx.HTTPError,asyncio.TimeoutError) as e:
+            logger.error(f"Ollama streaming generation failed: {e!r}")
+            raise
+        stats["total"]=loop.time()-started
+        logger.info(
+            f"Ollama stream: ttft={stats['ttft'] or 0:.2f}s json={stats['time_to_json'] or 0:.2f}s "
+            f"tokens={stats['tokens']} stopped_early={stats['stopped_early']}"
+        )
+        return text,stats
+
+    async def chat(self,messages:list,timeout:Optional[float]=None,**kwargs)->str:
+        payload={
+            "model":self.model,
+            "messages":messages,
+            "stream":False,
+            "options":_options(kwargs)
+        }
+        try:
+            result=await self._post("/api/chat",payload,timeout)
+            return result.get("message",{}).get("content","")
+        except (httpx.HTTPError,asyncio.TimeoutError) as e:
+            logger.error(f"Ollama chat failed: {e!r}")
+            raise
+
+    async def aclose(self)->None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client=None
+
 _config: Optional[OllamaConfig]=None
+_async_client: Optional[AsyncOllamaClient]=None
 
 def get_ollama_client()->OllamaConfig:
     global _config
@@ -96,9 +259,21 @@ def get_ollama_client()->OllamaConfig:
 
     return _config
 
+def get_async_ollama_client()->AsyncOllamaClient:
+    global _async_client
+
+    if _async_client is None:
+        _async_client=AsyncOllamaClient()
+
+    return _async_client
+
+async def close_ollama_client()->None:
+    if _async_client is not None:
+        await _async_client.aclose()
+
 def reset_ollama_client():
     global _config
-    _confi=None
+    _config=None
 
 OLLAMA_MODEL="qwen2.5-coder:3b"
 OLLAMA_MAX_TOKENS=4096
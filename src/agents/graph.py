@@ -6,7 +6,10 @@ from datetime import datetime
 from src.agents.state import AgentState
 from src.agents.nodes.start_node import start_node
 from src.agents.nodes.github_monitor_node import github_monitor_node
+from src.agents.nodes.org_monitor_node import org_monitor_node
 from src.agents.nodes.analysis_node import failure_analysis_node
+from src.agents.config import close_ollama_client
+from mcp_servers.github_mcp import close_github_client
 
 logging.basicConfig(level=logging.INFO)
 logger=logging.getLogger("AgentGraph")
@@ -21,10 +24,19 @@ class AgentWorkflowGraph:
     def _build_graph(self):
         self.graph.add_node("start",start_node)
         self.graph.add_node("github_monitor",github_monitor_node)
+        self.graph.add_node("org_monitor",org_monitor_node)
         self.graph.add_node("analysis",failure_analysis_node)
 
         self.graph.set_entry_point("start")
-        self.graph.add_edge("start","github_monitor")
+        self.graph.add_conditional_edges(
+            "start",
+            self._route_after_start,
+            {
+                "github_monitor":"github_monitor",
+                "org_monitor":"org_monitor",
+                "end":END
+            }
+        )
 
         self.graph.add_conditional_edges(
             "github_monitor",
@@ -34,7 +46,20 @@ class AgentWorkflowGraph:
                 "end":END
             }
         )
+        self.graph.add_conditional_edges(
+            "org_monitor",
+            self._route_after_monitor,
+            {
+                "continue":"org_monitor",
+                "end":END
+            }
+        )
         logger.info("Graph structure built successfully")
+
+    def _route_after_start(self,state:AgentState)->str:
+        if state.status=="error":
+            return "end"
+        return "org_monitor" if "org" in state.context else "github_monitor"
     
     def _route_after_monitor(self,state:AgentState)->str:
         failures=state.context.get("detected_failures",[])
@@ -78,7 +103,11 @@ class AgentWorkflowGraph:
         else:
             state=initial_state
 
-        result=await self.app.ainvoke(state)
+        try:
+            result=await self.app.ainvoke(state)
+        finally:
+            await close_github_client()
+            await close_ollama_client()
 
         logger.info("Graph execution completed")
 
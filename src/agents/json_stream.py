@@ -0,0 +1,53 @@
+from typing import Optional
+
+class JsonObjectScanner:
+    """
+    Incremental scanner that spots the end of the first top-level JSON object
+    in a stream of text chunks.
+
+    Tracks brace depth outside of string literals (escapes included), so
+    braces inside strings do not count. Anything before the first "{" (e.g.
+    ```json fences or chatter) is skipped.
+    """
+
+    def __init__(self):
+        self.depth=0
+        self.in_string=False
+        self.escaped=False
+        self.started=False
+        self._parts=[]
+
+    def feed(self,chunk:str)->Optional[str]:
+        """Consume a chunk; returns the complete object text once its closing brace arrives."""
+        start=0
+        for i,ch in enumerate(chunk):
+            if not self.started:
+                if ch!="{":
+                    continue
+                self.started=True
+                start=i
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped=False
+                elif ch=="\\":
+                    self.escaped=True
+                elif ch=='"':
+                    self.in_string=False
+            elif ch=='"':
+                self.in_string=True
+            elif ch=="{":
+                self.depth+=1
+            elif ch=="}":
+                self.depth-=1
+                if self.depth==0:
+                    self._parts.append(chunk[start:i+1])
+                    return "".join(self._parts)
+
+        if self.started:
+            self._parts.append(chunk[start:])
+        return None
+
+def extract_json_object(text:str)->Optional[str]:
+    """First balanced top-level JSON object in text, or None."""
+    return JsonObjectScanner().feed(text)
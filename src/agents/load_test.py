@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0,str(Path(__file__).parent.parent))
+
+def _free_port()->int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1",0))
+        return sock.getsockname()[1]
+
+def _configure_env(port:int)->None:
+    # the shared GitHub client, sync store and log store read these on first use
+    os.environ["GITHUB_API_URL"]=f"http://127.0.0.1:{port}"
+    os.environ["GITHUB_TOKEN"]="fake-token"
+    os.environ.pop("GITHUB_TOKENS",None)
+    state_dir=tempfile.mkdtemp(prefix="load-test-state-")
+    os.environ["SYNC_STORE_PATH"]=os.path.join(state_dir,"sync.db")
+    os.environ["LOG_STORE_DIR"]=os.path.join(state_dir,"logs")
+
+async def run_load_test(args)->None:
+    from mcp_servers.fake_github import FakeGitHub
+    from mcp_servers.workload import Workload
+    from mcp_servers.github_mcp import get_github_client
+    from .graph import create_agent_graph
+    from .state import AgentState
+    from .nodes.analysis_node import fetch_failure_logs
+    from .log_store import get_log_store
+
+    workload=Workload(owner=args.owner,repos=args.repos,runs_per_repo=args.runs,failure_rate=args.failure_rate,seed=args.seed)
+    fake=FakeGitHub(workload,latency=args.latency,jitter=args.jitter,error_rate=args.error_rate,seed=args.seed)
+    await fake.start(port=args.port)
+    github=get_github_client()
+    log_store=get_log_store()
+
+    print(f"Fake GitHub at {github.base_url}: {args.repos} repos x {args.runs} runs, {workload.failed_runs} failed")
+    print(f"Latency {args.latency*1000:.0f}ms +/- {args.jitter*1000:.0f}ms, error rate {args.error_rate:.0%}, concurrency {args.concurrency}\n")
+    print(f"{'scenario':<28}{'wall s':>9}{'requests':>10}{'304s':>7}{'5xx':>6}{'blob KB':>10}  result")
+
+    async def scenario(name:str,coro):
+        before=dict(fake.stats)
+        start=time.perf_counter()
+        result=await coro
+        elapsed=time.perf_counter()-start
+        delta={key:fake.stats[key]-before[key] for key in before}
+        print(
+            f"{name:<28}{elapsed:>9.2f}{delta['requests']:>10}{delta['not_modified']:>7}"
+            f"{delta['errors_injected']:>6}{delta['blob_bytes']/1024:>10.0f}  {result}"
+        )
+
+    semaphore=asyncio.Semaphore(args.concurrency)
+
+    async def poll_repo(full_name:str)->list:
+        owner,repo=full_name.split("/")
+        async with semaphore:
+            return [run async for run in github.iter_failed_runs(owner,repo,branch=None,limit=args.max_failed_runs)]
+
+    async def poll_all()->str:
+        results=await asyncio.gather(*(poll_repo(full_name) for full_name in workload.runs),return_exceptions=True)
+        errors=sum(isinstance(result,BaseException) for result in results)
+        runs=sum(len(result) for result in results if not isinstance(result,BaseException))
+        return f"{runs} failed runs, {errors} repo errors"
+
+    async def fetch_logs()->str:
+        failed=[run for run in workload.runs_by_id.values() if run["conclusion"]=="failure"][:args.log_runs]
+
+        async def fetch(run:dict)->int:
+            owner,repo=run["_repo"].split("/")
+            async with semaphore:
+                return len(await fetch_failure_logs(github,owner,repo,run["id"],run["run_attempt"],log_store))
+
+        sizes=await asyncio.gather(*(fetch(run) for run in failed),return_exceptions=True)
+        errors=sum(isinstance(size,BaseException) for size in sizes)
+        chars=sum(size for size in sizes if not isinstance(size,BaseException))
+        return f"{len(failed)-errors} runs, {chars/1024:.0f}K chars, {errors} errors"
+
+    states=[]
+
+    async def sweep(graph,state:AgentState)->str:
+        state=await graph.execute(state)
+        states.append(state)
+        report=state.context.get("org_report",{})
+        return (
+            f"{report.get('repos_scanned',0)} repos, {report.get('repos_skipped',0)} skipped, "
+            f"{report.get('new_failures',0)} new failures, status={state.status}"
+        )
+
+    try:
+        await scenario("poll failed runs",poll_all())
+        await scenario("poll again (ETag cache)",poll_all())
+        await scenario("failure logs (cold)",fetch_logs())
+        await scenario("failure logs (log store)",fetch_logs())
+
+        graph=create_agent_graph()
+        state=AgentState(
+            id="agent-load-test",
+            name="Load Test",
+            role="monitor_and_debug",
+            status="created",
+            memory=[],
+            goals=["Sweep the organization"],
+            current_task=None,
+            sub_tasks=[],
+            context={"org":args.owner,"max_failed_runs":args.max_failed_runs,"max_concurrent_repos":args.concurrency,"repo_pushed_within_days":0},
+            last_updated=datetime.now().isoformat()
+        )
+        await scenario("graph org sweep",sweep(graph,state))
+        await scenario("graph org sweep (repeat)",sweep(graph,states[-1]))
+    finally:
+        await github.aclose()
+        await fake.stop()
+
+    print(f"\nServer totals: {fake.stats}")
+    print(f"Client cache: {github.cache.stats() if github.cache else 'disabled'}, single-flight: {github.single_flight.stats()}")
+    print(f"Circuit breakers: {[breaker.status() for breaker in github.breakers.values()]}")
+
+    print(f"\n{'endpoint':<52}{'requests':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for series in sorted(github.metrics.snapshot()["github_api_request_duration_seconds"]["series"],key=lambda s:-s["count"]):
+        labels=series["labels"]
+        print(
+            f"{labels['method']+' '+labels['endpoint']:<52}{series['count']:>9}"
+            f"{series['p50']*1000:>9.1f}{series['p95']*1000:>9.1f}{series['p99']*1000:>9.1f}"
+        )
+
+if __name__=="__main__":
+    parser=argparse.ArgumentParser(description="Load test GitHubMCP and the agent graph against the local fake GitHub API")
+    parser.add_argument("--owner",default="acme")
+    parser.add_argument("--repos",type=int,default=50)
+    parser.add_argument("--runs",type=int,default=200,help="runs per repo")
+    parser.add_argument("--failure-rate",type=float,default=0.2)
+    parser.add_argument("--max-failed-runs",type=int,default=50)
+    parser.add_argument("--log-runs",type=int,default=20,help="failed runs to fetch logs for")
+    parser.add_argument("--latency",type=float,default=0.05)
+    parser.add_argument("--jitter",type=float,default=0.02)
+    parser.add_argument("--error-rate",type=float,default=0.0)
+    parser.add_argument("--concurrency",type=int,default=16)
+    parser.add_argument("--seed",type=int,default=0)
+    parser.add_argument("--port",type=int,default=0)
+    args=parser.parse_args()
+
+    args.port=args.port or _free_port()
+    _configure_env(args.port)
+    asyncio.run(run_load_test(args))
+
+#python -m src.agents.load_test --repos 100 --runs 300 --error-rate 0.02
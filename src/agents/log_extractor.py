@@ -0,0 +1,202 @@
+import os
+import re
+import heapq
+from collections import deque
+from typing import Optional, Iterable, List, Tuple, Union
+from .log_normalizer import strip_line_noise
+
+DEFAULT_TOKEN_BUDGET=int(os.getenv("LOG_EXCERPT_TOKENS","800"))
+CHARS_PER_TOKEN=4
+TAIL_LINES=15
+CONTEXT_BEFORE=3
+CONTEXT_AFTER=6
+MAX_TRACEBACK_LINES=60
+MAX_WINDOWS=64
+TAIL_SCORE=4
+
+# (pattern, score); only lines passing the cheap substring prefilter reach these
+_SIGNALS=[
+    (re.compile(r"##\[error\]"),10),
+    (re.compile(r"^(?:E\s+)?[A-Za-z_][\w.$]*(?:Error|Exception)\b:?"),8),
+    (re.compile(r"^(?:FAILED|ERROR) \S+::|--- FAIL: |^\s*● "),8),
+    (re.compile(r"\b(?:panic|fatal|FATAL):"),8),
+    (re.compile(r"^\s*(?:[\w.-]+\.\w+):\d+(?::\d+)?: (?:error|fatal error)\b"),7),
+    (re.compile(r"\b(?:Error|ERROR|error)(?:\[\w+\])?:"),5),
+    (re.compile(r"npm ERR!|ERR_PNPM|error TS\d+|ERROR in "),5),
+    (re.compile(r"\b(?:failed|FAILED|Failed)\b"),3),
+    (re.compile(r"exit code [1-9]|exited with code [1-9]|Process completed with exit code"),3),
+    (re.compile(r"\b(?:timed out|Timeout|timeout exceeded|exceeded the maximum execution time)\b",re.I),4)
+]
+_PREFILTER=("error","fail","exception","panic","fatal","exit code","time","err!","●")
+_SECTION_HEADER="===== "
+
+def score_line(line:str)->int:
+    lowered=line.lower()
+    if not any(marker in lowered for marker in _PREFILTER):
+        return 0
+    return max((score for pattern,score in _SIGNALS if pattern.search(line)),default=0)
+
+class _Window:
+    __slots__=("start","entries","score","header","open_until","in_traceback")
+
+    def __init__(self,entries:List[Tuple[int,str]],header:Optional[str]):
+        self.start=entries[0][0]
+        self.entries=entries
+        self.score=0
+        self.header=header
+        self.open_until=0
+        self.in_traceback=False
+
+    def __lt__(self,other:"_Window")->bool:
+        # heap order: lowest score first, then earliest, so late errors win ties
+        return (self.score,self.start)<(other.score,other.start)
+
+class ErrorWindowExtractor:
+    """
+    Single pass over a log that keeps the windows most likely to explain a
+    failure: error annotations, exceptions and tracebacks, failed tests and
+    error lines, each with a few lines of context, plus the final lines of
+    the log. Windows are ranked by the summed score of their lines and
+    packed into a token budget, best first, then printed in log order under
+    the section header they belong to.
+
+    Memory stays bounded: at most MAX_WINDOWS windows are kept, the lowest
+    scored ones being dropped as better ones arrive.
+    """
+
+    def __init__(
+        self,
+        token_budget:int=DEFAULT_TOKEN_BUDGET,
+        tail_lines:int=TAIL_LINES,
+        context_before:int=CONTEXT_BEFORE,
+        context_after:int=CONTEXT_AFTER
+    ):
+        self.token_budget=token_budget
+        self.context_after=context_after
+        self.lines_seen=0
+        self._before:deque=deque(maxlen=context_before)
+        self._tail:deque=deque(maxlen=tail_lines)
+        self._windows:List[_Window]=[]
+        self._current:Optional[_Window]=None
+        self._header:Optional[str]=None
+
+    def feed(self,line:str)->None:
+        line=strip_line_noise(line.rstrip())
+        number=self.lines_seen
+        self.lines_seen+=1
+        if not line.strip():
+            return
+
+        if line.startswith(_SECTION_HEADER):
+            self._close_window()
+            self._header=line
+            self._before.clear()
+            return
+
+        self._tail.append((number,line,self._header))
+        score=score_line(line)
+        traceback=line.startswith("Traceback (most recent call last)")
+        window=self._current
+
+        if window is not None:
+            if window.in_traceback and len(window.entries)<MAX_TRACEBACK_LINES:
+                # a python traceback runs until the first unindented line, the exception itself
+                window.entries.append((number,line))
+                window.score+=score
+                if not line[:1].isspace() and not traceback:
+                    window.in_traceback=False
+                    window.open_until=number+self.context_after
+                return
+            if number<=window.open_until or score or traceback:
+                window.entries.append((number,line))
+                window.score+=score
+                if score:
+                    window.open_until=number+self.context_after
+                window.in_traceback=traceback
+                return
+            self._close_window()
+
+        if score or traceback:
+            window=_Window(list(self._before)+[(number,line)],self._header)
+            window.score=score
+            window.open_until=number+self.context_after
+            window.in_traceback=traceback
+            self._current=window
+            self._before.clear()
+        else:
+            self._before.append((number,line))
+
+    def _close_window(self)->None:
+        window=self._current
+        self._current=None
+        if window is None:
+            return
+        if len(self._windows)<MAX_WINDOWS:
+            heapq.heappush(self._windows,window)
+        elif self._windows[0]<window:
+            heapq.heapreplace(self._windows,window)
+
+    def extract(self)->str:
+        self._close_window()
+        candidates=list(self._windows)
+        if self._tail:
+            # the final lines, grouped by the section each one came from
+            for header in dict.fromkeys(header for _,_,header in self._tail):
+                entries=[(number,text) for number,text,line_header in self._tail if line_header==header]
+                tail=_Window(entries,header)
+                tail.score=TAIL_SCORE+sum(score_line(text) for _,text in entries)
+                candidates.append(tail)
+
+        selected={}
+        remaining=self.token_budget*CHARS_PER_TOKEN
+        for window in sorted(candidates,key=lambda w:(w.score,w.start),reverse=True):
+            entries=[(number,text) for number,text in window.entries if number not in selected]
+            size=sum(len(text)+1 for _,text in entries)
+            if not entries or (size>remaining and selected):
+                continue
+            if size>remaining:
+                # even the best window is over budget: keep its end, where the error is reported
+                kept=[]
+                for number,text in reversed(entries):
+                    if len(text)+1>remaining:
+                        break
+                    kept.append((number,text))
+                    remaining-=len(text)+1
+                entries=kept[::-1]
+            else:
+                remaining-=size
+            for number,text in entries:
+                selected[number]=(text,window.header)
+
+        out=[]
+        previous=None
+        header=None
+        repeats=0
+        for number in sorted(selected):
+            text,line_header=selected[number]
+            contiguous=previous is not None and number==previous+1
+            previous=number
+            if contiguous and line_header==header and out and text==out[-1]:
+                repeats+=1
+                continue
+            if repeats:
+                out.append(f"[repeated {repeats} more times]")
+                repeats=0
+            if line_header!=header:
+                if line_header:
+                    out.append(line_header)
+                header=line_header
+            elif not contiguous and len(out)>0:
+                out.append("[...]")
+            out.append(text)
+        if repeats:
+            out.append(f"[repeated {repeats} more times]")
+        return "\n".join(out)
+
+def extract_error_windows(log:Union[str,Iterable[str]],token_budget:int=DEFAULT_TOKEN_BUDGET)->str:
+    """The highest-value parts of a log (one string or an iterable of lines) within token_budget."""
+    lines=log.splitlines() if isinstance(log,str) else log
+    extractor=ErrorWindowExtractor(token_budget)
+    for line in lines:
+        extractor.feed(line)
+    return extractor.extract()
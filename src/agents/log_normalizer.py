@@ -0,0 +1,278 @@
+import re
+import hashlib
+from typing import Optional, Iterable, Iterator, List, Dict, Any
+
+# whole-chunk substitutions, applied with re.M over many lines at once: one C-level
+# pass per pattern is far cheaper than running every pattern line by line
+_ANSI=re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]|\x1b[()][0-9A-B]")
+_TIMESTAMP_PREFIX=re.compile(r"^\ufeff?\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d+)?Z ?",re.M)
+_TIMESTAMP=re.compile(r"\b\d{4}-\d\d-\d\d[T ]\d\d:\d\d:\d\d(?:[.,]\d+)?(?:Z|[+-]\d\d:?\d\d)?")
+_UUID=re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b")
+# a hash mixes letters and digits: words like "defaced" and plain numbers are left alone
+_SHA=re.compile(r"\b(?=[0-9a-f]*[0-9])(?=[0-9a-f]*[a-f])[0-9a-f]{7,64}\b")
+_TEMP_PATH=re.compile(
+    r"(?:/tmp|/private/var/folders|/var/folders|/home/runner/work/_temp|/Users/runner/work/_temp"
+    r"|[A-Za-z]:\\(?:Users\\[^\\\s]+\\AppData\\Local\\Temp|a\\_temp))[^\s'\"`:,;)\]]*"
+)
+_DURATION_UNIT=r"(?:ms|s|sec|secs|seconds|m|min|mins|minutes|h)"
+# "12s" anywhere, but "12 s" only where no word follows, so "10 m records" stays as it is
+_DURATION=re.compile(rf"\b\d+(?:\.\d+)?(?:{_DURATION_UNIT}\b| {_DURATION_UNIT}(?![ \t]*\w))")
+# led by the literal ":" so the scan jumps between colons instead of trying every position
+_PORT=re.compile(r":(?:(?<=localhost:)|(?<=\]:)|(?<=\.\d:)|(?<=\.\d\d:)|(?<=\.\d\d\d:))\d{2,5}\b")
+_PORT_WORD=re.compile(r"\b(port:? )\d{2,5}\b")
+
+# cheap literal-led probes: the full patterns above only run on blocks these find something in
+_TIMESTAMP_PROBE=re.compile(r":\d\d:\d\d")
+_UUID_PROBE=re.compile(r"-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-")
+_TEMP_MARKERS=("/tmp","/var/folders","_temp","\\Temp")
+
+MAX_FRAMES=3
+MAX_TESTS=20
+
+_PY_FRAME=re.compile(r'^\s*File "([^"]+)", line \d+, in (\S+)')
+_PYTEST_LOCATION=re.compile(r"^([\w./<>-]+\.py):\d+: (\w+)$")
+_JS_FRAME=re.compile(r"^\s+at (?:(?:async )?([\w$.<>\[\] ]+?) \()?([^():\s]+)(?::\d+){0,2}\)?$")
+_JAVA_FRAME=re.compile(r"^\s+at ([\w$.]+)\.([\w$<>]+)\(([\w$.]+)(?::\d+)?\)$")
+_EXCEPTION=re.compile(
+    r"^(?:E\s+)?(?:(?:Uncaught|Unhandled|Caused by:)\s+)?"
+    r"([A-Za-z_][\w.$]*(?:Error|Exception|Failure|Interrupt|Exit|Fault))(?::|$|\s)(.*)"
+)
+_PYTEST_FAILED=re.compile(r"^(?:FAILED|ERROR) (\S+::\S+)")
+_GO_FAIL=re.compile(r"^\s*--- FAIL: (\S+)")
+_JEST_FAIL=re.compile(r"^\s*● (.+?)\s*$")
+_NPM_CODE=re.compile(r"^npm ERR! code (\S+)")
+_GH_ERROR="##[error]"
+
+def normalize_text(text:str)->str:
+    """Mask the volatile parts of a block of log lines (timestamps, ids, temp paths, durations, ports)."""
+    if "\x1b" in text:
+        text=_ANSI.sub("",text)
+    text=_TIMESTAMP_PREFIX.sub("",text)
+    if _TIMESTAMP_PROBE.search(text):
+        text=_TIMESTAMP.sub("<ts>",text)
+    if _UUID_PROBE.search(text):
+        text=_UUID.sub("<uuid>",text)
+    text=_SHA.sub("<sha>",text)
+    if any(marker in text for marker in _TEMP_MARKERS):
+        text=_TEMP_PATH.sub("<tmp>",text)
+    text=_DURATION.sub("<duration>",text)
+    if "port" in text:
+        text=_PORT_WORD.sub(r"\1<port>",text)
+    return _PORT.sub(":<port>",text)
+
+def strip_line_noise(line:str)->str:
+    """Drop ANSI codes and the GitHub timestamp prefix of one raw line, leaving the text readable."""
+    if "\x1b" in line:
+        line=_ANSI.sub("",line)
+    if line[:1].isdigit() or line[:1]=="\ufeff":
+        line=_TIMESTAMP_PREFIX.sub("",line,count=1)
+    return line
+
+class LogNormalizer:
+    """
+    Streaming normalizer: feed() raw chunks in any size, get back canonical
+    lines. Volatile tokens are masked (see normalize_text), trailing
+    whitespace and blank lines dropped, and runs of identical lines collapsed
+    into the line plus a "[repeated N more times]" marker.
+
+    Chunks are buffered up to block_size characters so the masking regexes
+    run over large blocks instead of one line at a time.
+    """
+
+    def __init__(self,collapse_repeats:bool=True,block_size:int=1<<20):
+        self.collapse_repeats=collapse_repeats
+        self.block_size=block_size
+        self.lines_in=0
+        self.lines_out=0
+        self.chars_in=0
+        self._pending:List[str]=[]
+        self._pending_size=0
+        self._previous:Optional[str]=None
+        self._repeats=0
+
+    def feed(self,chunk:str)->List[str]:
+        self.chars_in+=len(chunk)
+        self._pending.append(chunk)
+        self._pending_size+=len(chunk)
+        if self._pending_size<self.block_size:
+            return []
+
+        text="".join(self._pending)
+        cut=text.rfind("\n")+1
+        if cut==0:
+            self._pending=[text]
+            return []
+        self._pending=[text[cut:]]
+        self._pending_size=len(text)-cut
+        return self._emit(text[:cut])
+
+    def close(self)->List[str]:
+        """Flush the buffered tail and any pending repeat marker."""
+        text="".join(self._pending)
+        self._pending=[]
+        self._pending_size=0
+        out=self._emit(text) if text else []
+        if self._repeats:
+            out.append(f"[repeated {self._repeats} more times]")
+            self.lines_out+=1
+            self._repeats=0
+        return out
+
+    def _emit(self,text:str)->List[str]:
+        lines=normalize_text(text).splitlines()
+        self.lines_in+=len(lines)
+        out=[]
+        previous=self._previous
+        repeats=self._repeats
+        for line in lines:
+            line=line.rstrip()
+            if not line:
+                continue
+            if self.collapse_repeats and line==previous:
+                repeats+=1
+                continue
+            if repeats:
+                out.append(f"[repeated {repeats} more times]")
+                repeats=0
+            out.append(line)
+            previous=line
+        self._previous=previous
+        self._repeats=repeats
+        self.lines_out+=len(out)
+        return out
+
+def normalize_lines(chunks:Iterable[str],collapse_repeats:bool=True)->Iterator[str]:
+    normalizer=LogNormalizer(collapse_repeats)
+    for chunk in chunks:
+        yield from normalizer.feed(chunk)
+    yield from normalizer.close()
+
+def normalize_log(text:str,collapse_repeats:bool=True)->str:
+    return "\n".join(normalize_lines([text],collapse_repeats))
+
+def _short_path(path:str)->str:
+    # runner checkouts differ per repo and machine; the last two components identify the file
+    return "/".join(path.replace("\\","/").rsplit("/",2)[-2:])
+
+class SignatureScanner:
+    """
+    Streaming extraction of a failure signature from normalized lines:
+    the last exception type with its innermost frames, and the failing test
+    ids. Lines are prefiltered with substring checks so most of them never
+    reach a regex.
+    """
+
+    def __init__(self):
+        self.exception_type:Optional[str]=None
+        self.message:Optional[str]=None
+        self.frames:List[str]=[]
+        self.failing_tests:List[str]=[]
+        self.error_annotation:Optional[str]=None
+        self._frames:List[str]=[]
+        # JS and Java print the stack after the exception, innermost frame first
+        self._trailing=False
+
+    def _add_test(self,test_id:str)->None:
+        if test_id not in self.failing_tests and len(self.failing_tests)<MAX_TESTS:
+            self.failing_tests.append(test_id)
+
+    def _set_exception(self,exception_type:str,message:str)->None:
+        self.exception_type=exception_type
+        self.message=message.strip()[:200] or None
+        # python prints the stack before the exception, innermost frame last
+        self.frames=self._frames[::-1][:MAX_FRAMES]
+        self._frames=[]
+        self._trailing=True
+
+    def _add_trailing_frame(self,frame:str)->None:
+        if self._trailing and len(self.frames)<MAX_FRAMES:
+            self.frames.append(frame)
+
+    def feed(self,line:str)->None:
+        stripped=line.lstrip()
+        first=stripped[:1]
+
+        if first=="F":
+            if stripped.startswith("File \""):
+                match=_PY_FRAME.match(line)
+                if match:
+                    self._trailing=False
+                    self._frames.append(f"{_short_path(match.group(1))}:{match.group(2)}")
+                return
+            if stripped.startswith("FAILED "):
+                match=_PYTEST_FAILED.match(stripped)
+                if match:
+                    self._add_test(match.group(1))
+                return
+        elif first=="a" and stripped.startswith("at "):
+            match=_JAVA_FRAME.match(line)
+            if match:
+                self._add_trailing_frame(f"{match.group(3)}:{match.group(2)}")
+                return
+            match=_JS_FRAME.match(line)
+            if match:
+                self._add_trailing_frame(f"{_short_path(match.group(2))}:{match.group(1) or '<anonymous>'}")
+            return
+        elif first=="T" and stripped.startswith("Traceback (most recent call last)"):
+            self._frames=[]
+            self._trailing=False
+            return
+        elif first=="-" and "--- FAIL: " in line:
+            match=_GO_FAIL.match(line)
+            if match:
+                self._add_test(match.group(1))
+            return
+        elif first=="●":
+            match=_JEST_FAIL.match(line)
+            if match:
+                self._add_test(match.group(1))
+            return
+        elif first=="#" and stripped.startswith(_GH_ERROR):
+            self.error_annotation=stripped[len(_GH_ERROR):].strip()
+            return
+        elif first=="n" and stripped.startswith("npm ERR! code "):
+            match=_NPM_CODE.match(stripped)
+            if match:
+                self._set_exception(f"npm:{match.group(1)}","")
+            return
+
+        if "Error" in line or "Exception" in line or "Failure" in line or "Interrupt" in line or "Exit" in line:
+            if stripped.startswith("ERROR ") and "::" in stripped:
+                match=_PYTEST_FAILED.match(stripped)
+                if match:
+                    self._add_test(match.group(1))
+                    return
+            match=_PYTEST_LOCATION.match(stripped)
+            if match:
+                # pytest's "tests/test_x.py:88: AssertionError" follows the E lines it locates
+                if match.group(2)==self.exception_type and not self.frames:
+                    self.frames=[_short_path(match.group(1))]
+                return
+            match=_EXCEPTION.match(stripped)
+            if match:
+                self._set_exception(match.group(1),match.group(2))
+
+    def signature(self)->Dict[str,Any]:
+        test_id=self.failing_tests[0] if self.failing_tests else None
+        parts=[self.exception_type or "",*self.frames,test_id or ""]
+        if not self.exception_type and not test_id:
+            # nothing structured found: fall back to the last error annotation
+            parts.append(self.error_annotation or "")
+        return {
+            "exception_type":self.exception_type,
+            "message":self.message,
+            "frames":list(self.frames),
+            "test_id":test_id,
+            "failing_tests":list(self.failing_tests),
+            "error_annotation":self.error_annotation,
+            "fingerprint":hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+        }
+
+def failure_signature(chunks:Iterable[str])->Dict[str,Any]:
+    """Normalize a log (one string or a stream of chunks) and return its failure signature."""
+    if isinstance(chunks,str):
+        chunks=[chunks]
+    scanner=SignatureScanner()
+    for line in normalize_lines(chunks):
+        scanner.feed(line)
+    return scanner.signature()
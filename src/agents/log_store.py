@@ -0,0 +1,203 @@
+import os
+import gzip
+import time
+import sqlite3
+import hashlib
+import logging
+import tempfile
+from contextlib import contextmanager
+from typing import Optional, TextIO, Iterator, Dict, Any
+
+logger=logging.getLogger("LogStore")
+
+DEFAULT_LOG_STORE_DIR=".agent_state/logs"
+DEFAULT_LOG_STORE_MAX_BYTES=512*1024*1024
+
+# job_id used for the assembled failure log of a whole run attempt
+RUN_SUMMARY_JOB_ID=0
+
+class _BlobWriter:
+    """Text sink that gzips into a temp file while hashing the uncompressed content."""
+
+    def __init__(self,directory:str):
+        fd,self.path=tempfile.mkstemp(dir=directory,suffix=".tmp")
+        self._raw=os.fdopen(fd,"wb")
+        self._gzip=gzip.GzipFile(fileobj=self._raw,mode="wb",mtime=0)
+        self._hash=hashlib.sha256()
+
+    def write(self,text:str)->None:
+        data=text.encode("utf-8")
+        self._hash.update(data)
+        self._gzip.write(data)
+
+    def finish(self)->str:
+        self._gzip.close()
+        self._raw.close()
+        return self._hash.hexdigest()
+
+    def discard(self)->None:
+        self._gzip.close()
+        self._raw.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class LogStore:
+    """
+    Local cache of downloaded workflow logs keyed by (repo, run_id, run_attempt, job_id).
+
+    Blobs are gzip compressed and stored under the sha256 of their content, so
+    identical logs are kept once no matter how many keys point at them. The
+    total size of the blobs is capped; the least recently read entries are
+    evicted first. Logs of a finished attempt never change, so entries are
+    never invalidated, only evicted.
+    """
+
+    def __init__(self,root:Optional[str]=None,max_bytes:Optional[int]=None):
+        self.root=root or os.getenv("LOG_STORE_DIR",DEFAULT_LOG_STORE_DIR)
+        self.max_bytes=max_bytes or int(os.getenv("LOG_STORE_MAX_BYTES",DEFAULT_LOG_STORE_MAX_BYTES))
+        self.blob_dir=os.path.join(self.root,"blobs")
+        os.makedirs(self.blob_dir,exist_ok=True)
+
+        self.hits=0
+        self.misses=0
+
+        self._conn=sqlite3.connect(os.path.join(self.root,"index.db"))
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries(
+                repo TEXT NOT NULL,
+                run_id INTEGER NOT NULL,
+                run_attempt INTEGER NOT NULL,
+                job_id INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (repo,run_id,run_attempt,job_id)
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access);
+            CREATE TABLE IF NOT EXISTS blobs(
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def _blob_path(self,digest:str)->str:
+        return os.path.join(self.blob_dir,digest[:2],f"{digest}.gz")
+
+    def open(self,repo:str,run_id:int,run_attempt:int,job_id:int)->Optional[TextIO]:
+        """Return a text stream over the cached log, or None on a miss."""
+        key=(repo,run_id,run_attempt or 1,job_id)
+        row=self._conn.execute(
+            "SELECT digest FROM entries WHERE repo=? AND run_id=? AND run_attempt=? AND job_id=?",key
+        ).fetchone()
+
+        path=self._blob_path(row[0]) if row else None
+        if path is None or not os.path.exists(path):
+            self.misses+=1
+            return None
+
+        with self._conn:
+            self._conn.execute(
+                "UPDATE entries SET last_access=? WHERE repo=? AND run_id=? AND run_attempt=? AND job_id=?",
+                (time.time(),*key)
+            )
+        self.hits+=1
+        return gzip.open(path,"rt",encoding="utf-8",errors="replace")
+
+    def get(self,repo:str,run_id:int,run_attempt:int,job_id:int)->Optional[str]:
+        stream=self.open(repo,run_id,run_attempt,job_id)
+        if stream is None:
+            return None
+        with stream:
+            return stream.read()
+
+    @contextmanager
+    def writer(self,repo:str,run_id:int,run_attempt:int,job_id:int)->Iterator[_BlobWriter]:
+        """Stream a log into the store; the entry is only committed if the block completes."""
+        blob=_BlobWriter(self.blob_dir)
+        try:
+            yield blob
+        except BaseException:
+            blob.discard()
+            raise
+
+        digest=blob.finish()
+        path=self._blob_path(digest)
+        if os.path.exists(path):
+            os.remove(blob.path)
+        else:
+            os.makedirs(os.path.dirname(path),exist_ok=True)
+            os.replace(blob.path,path)
+
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO blobs(digest,size) VALUES (?,?)",
+                (digest,os.path.getsize(path))
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries(repo,run_id,run_attempt,job_id,digest,last_access) VALUES (?,?,?,?,?,?)",
+                (repo,run_id,run_attempt or 1,job_id,digest,time.time())
+            )
+        self._evict()
+
+    def put(self,repo:str,run_id:int,run_attempt:int,job_id:int,text:str)->None:
+        with self.writer(repo,run_id,run_attempt,job_id) as blob:
+            blob.write(text)
+
+    def total_bytes(self)->int:
+        return self._conn.execute("SELECT COALESCE(SUM(size),0) FROM blobs").fetchone()[0]
+
+    def _evict(self)->None:
+        total=self.total_bytes()
+        while total>self.max_bytes:
+            row=self._conn.execute(
+                "SELECT repo,run_id,run_attempt,job_id,digest FROM entries ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+
+            *key,digest=row
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE repo=? AND run_id=? AND run_attempt=? AND job_id=?",key
+                )
+                referenced=self._conn.execute(
+                    "SELECT 1 FROM entries WHERE digest=? LIMIT 1",(digest,)
+                ).fetchone()
+                if referenced:
+                    continue
+
+                size=self._conn.execute("SELECT size FROM blobs WHERE digest=?",(digest,)).fetchone()
+                self._conn.execute("DELETE FROM blobs WHERE digest=?",(digest,))
+
+            path=self._blob_path(digest)
+            if os.path.exists(path):
+                os.remove(path)
+            total-=size[0] if size else 0
+            logger.debug(f"Evicted log blob {digest[:12]}")
+
+    def stats(self)->Dict[str,Any]:
+        entries=self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        blobs=self._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+        lookups=self.hits+self.misses
+        return {
+            "entries":entries,
+            "blobs":blobs,
+            "total_bytes":self.total_bytes(),
+            "max_bytes":self.max_bytes,
+            "hits":self.hits,
+            "misses":self.misses,
+            "hit_rate":self.hits/lookups if lookups else 0.0
+        }
+
+    def close(self)->None:
+        self._conn.close()
+
+_store: Optional[LogStore]=None
+
+def get_log_store()->LogStore:
+    global _store
+
+    if _store is None:
+        _store=LogStore()
+
+    return _store
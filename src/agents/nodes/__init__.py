@@ -1,9 +1,11 @@
 from .start_node import start_node
 from .github_monitor_node import github_monitor_node
+from .org_monitor_node import org_monitor_node
 from .analysis_node import failure_analysis_node
 __all__=[
     "start_node",
     "github_monitor_node",
+    "org_monitor_node",
     "failure_analysis_node",
 ]
 
@@ -1,17 +1,37 @@
+import asyncio
+import inspect
 import logging
 import json
+import os
+from collections import deque
 from datetime import datetime
 from typing import Optional,Any,Dict,List
+import httpx
 from ..state import AgentState
-from ..config import get_ollama_client,OLLAMA_MODEL,OLLAMA_MAX_TOKENS,OLLAMA_TEMPERATURE
+from ..json_stream import extract_json_object
+from ..pipeline import Pipeline,Stage,StageError
+from ..log_store import LogStore,get_log_store,RUN_SUMMARY_JOB_ID
+from ..analysis_cache import get_analysis_cache,make_key
+from ..log_normalizer import failure_signature
+from ..log_extractor import extract_error_windows,DEFAULT_TOKEN_BUDGET as LOG_EXCERPT_TOKENS
+from ..config import get_async_ollama_client,OLLAMA_MODEL,OLLAMA_NUM_PARALLEL,OLLAMA_STREAM,OLLAMA_MAX_TOKENS,OLLAMA_TEMPERATURE
 
 import sys
 from pathlib import Path
 sys.path.insert(0,str(Path(__file__).parent.parent.parent))
-from mcp_servers.github_mcp import GitHubMCP
+from mcp_servers.github_mcp import GitHubMCP,WorkflowJob,RangeNotSupportedError,get_github_client
+from mcp_servers.single_flight import SingleFlight
 
 logger=logging.getLogger("AnalysisNode")
 
+MAX_LOG_CHARS=100_000
+MAX_LOG_LINES_PER_FILE=400
+NO_LOGS_MARKER="[NO_LOGS]"
+FETCH_ERROR_MARKER="[ERROR]"
+ANALYSIS_TIMEOUT=float(os.getenv("ANALYSIS_TIMEOUT","300"))
+LOG_FETCH_CONCURRENCY=int(os.getenv("LOG_FETCH_CONCURRENCY","8"))
+PREPROCESS_CONCURRENCY=int(os.getenv("PREPROCESS_CONCURRENCY","2"))
+
 FAILURE_ANALYSIS_PROMPT="""You are an expert DevOps engineer analyzing GitHub Actions workflow failures.
 
 Analyze the following workflow failures and provide a structured classification.
@@ -71,41 +91,127 @@ Rate 0.0 (very uncertain) to 1.0 (very certain).
 IMPORTANT: Return ONLY the JSON object. No markdown code blocks, no extra text.
 """
 
-async def fetch_failure_logs(github: GitHubMCP,owner: str, repo: str, run_id:int)->str:
+def _join_sections(sections:List[str])->str:
+    """Join log sections, dropping the oldest ones once MAX_LOG_CHARS is exceeded."""
+    total_chars=sum(len(section) for section in sections)
+    while total_chars>MAX_LOG_CHARS and len(sections)>1:
+        total_chars-=len(sections.pop(0))
+    return "\n".join(sections)
+
+def _archive_job_dir(job_name:str)->str:
+    # the run archive names job directories after the job, minus path-unsafe characters
+    return "".join(ch for ch in job_name if ch not in '/\\:*?"<>|')
+
+async def fetch_failed_step_logs(github: GitHubMCP,owner: str, repo: str, run_id:int, jobs:List[WorkflowJob])->List[str]:
+    """Range-read just the failed steps' files out of the run log archive."""
+    wanted={}
+    for job in jobs:
+        for step in job.steps:
+            if step.conclusion=="failure":
+                wanted[(_archive_job_dir(job.name),step.number)]=(job.name,step.name)
+    if not wanted:
+        return []
+
+    reader=await github.open_run_logs_remote(owner,repo,run_id)
+    sections=[]
+    for member in reader.namelist():
+        directory,_,filename=member.partition("/")
+        number=filename.split("_",1)[0]
+        if not number.isdigit() or (directory,int(number)) not in wanted:
+            continue
+
+        job_name,step_name=wanted[(directory,int(number))]
+        text=await reader.read_text(member)
+        tail=text.splitlines()[-MAX_LOG_LINES_PER_FILE:]
+        sections.append(f"===== {job_name} / {step_name} =====\n"+"\n".join(tail)+"\n")
+
+    logger.info(
+        f"Read {len(sections)} failed step logs for run {run_id} "
+        f"({reader.bytes_transferred} of {reader.size} archive bytes)"
+    )
+    return sections
+
+async def fetch_failed_job_logs(github: GitHubMCP,owner: str, repo: str, run_id:int, jobs:List[WorkflowJob], run_attempt:int=1, log_store:Optional[LogStore]=None)->List[str]:
+    """Download only the logs of the jobs that failed, via the Jobs API."""
+    repo_key=f"{owner}/{repo}"
+    sections=[]
+    for job in jobs:
+        failed_steps=[step.name for step in job.steps if step.conclusion=="failure"]
+
+        stream=log_store.open(repo_key,run_id,run_attempt,job.id) if log_store else None
+        if stream is None and log_store:
+            with log_store.writer(repo_key,run_id,run_attempt,job.id) as blob:
+                async for line in github.iter_job_log_lines(owner,repo,job.id):
+                    blob.write(line+"\n")
+            stream=log_store.open(repo_key,run_id,run_attempt,job.id)
+
+        # errors sit at the end of a job log, keep only its tail
+        if stream is not None:
+            with stream:
+                tail=deque((line.rstrip("\n") for line in stream),maxlen=MAX_LOG_LINES_PER_FILE)
+        else:
+            tail=deque(maxlen=MAX_LOG_LINES_PER_FILE)
+            async for line in github.iter_job_log_lines(owner,repo,job.id):
+                tail.append(line)
+
+        header=f"===== {job.name} (failed steps: {', '.join(failed_steps) or 'unknown'}) ====="
+        sections.append(header+"\n"+"\n".join(tail)+"\n")
+    return sections
+
+async def fetch_failure_logs(github: GitHubMCP,owner: str, repo: str, run_id:int, run_attempt:int=1, log_store:Optional[LogStore]=None)->str:
+    repo_key=f"{owner}/{repo}"
     try:
-        logs_response=await github.get_run_logs(owner,repo,run_id)
-        
-        if logs_response.error:
-            return f"[ERROR] {logs_response.error}"
-        
-        if logs_response.download_url:
-            return f"[LOGS_AVAILABLE] Currently not going to be implemented.\n\nLogs are available on GitHub."
+        if log_store:
+            cached=log_store.get(repo_key,run_id,run_attempt,RUN_SUMMARY_JOB_ID)
+            if cached is not None:
+                logger.info(f"Using cached logs for run {run_id} (attempt {run_attempt})")
+                return cached
+
+        all_jobs=(await github.get_run_jobs(owner,repo,run_id,filter="latest")).jobs
+        jobs=[job for job in all_jobs if job.conclusion=="failure"]
+        # while jobs are still running more of them can fail; only a finished attempt's summary is final
+        completed=all(job.status=="completed" for job in all_jobs)
+
+        sections=[]
+        try:
+            sections=await fetch_failed_step_logs(github,owner,repo,run_id,jobs)
+        except (RangeNotSupportedError,ValueError,KeyError) as e:
+            logger.info(f"Range reading the log archive failed, using job logs instead: {e}")
+        except httpx.HTTPStatusError as e:
+            # e.g. 404/410 once the archive is gone; the job logs may still be there
+            logger.info(f"Log archive unavailable ({e.response.status_code}), using job logs instead")
+
+        if not sections:
+            sections=await fetch_failed_job_logs(github,owner,repo,run_id,jobs,run_attempt,log_store)
+
+        if not sections:
+            # no failed job reported, fall back to the whole run archive
+            async for name,stream in github.iter_run_log_files(owner,repo,run_id,steps_only=True):
+                tail=deque(stream,maxlen=MAX_LOG_LINES_PER_FILE)
+                sections.append(f"===== {name} =====\n"+"".join(tail))
+
+        if sections:
+            logs=_join_sections(sections)
+            if log_store and completed:
+                log_store.put(repo_key,run_id,run_attempt,RUN_SUMMARY_JOB_ID,logs)
+            return logs
         
-        return "[NO_LOGS] No logs available for this run"
+        return f"{NO_LOGS_MARKER} No logs available for this run"
     
     except Exception as e:
         logger.error(f"Error fetching logs:{e}")
-        return f"[ERROR] Failed to fetch logs: {str(e)}"
+        return f"{FETCH_ERROR_MARKER} Failed to fetch logs: {str(e)}"
+
+def is_placeholder_logs(logs:str)->bool:
+    """True for the stand-in text fetch_failure_logs returns when it has no real logs."""
+    return logs.startswith((NO_LOGS_MARKER,FETCH_ERROR_MARKER))
 
 def parse_ollama_response(response_text:str)->Dict[str,Any]:
     try:
         text=response_text.strip()
 
-        if "```json" in text:
-            s=text.find("``json")+7
-            e=text.find("```",s)
-            text=text[s:e].strip()
-        elif "```" in text:
-            s=text.find("```")+3
-            e=text.find("```",s)
-            text=text[s:e].strip()
-
-        if "{" in text and "}" in text:
-            s=text.find("{")
-            e=text.find("}")
-            text=text[s:e]
-        
-        parsed=json.loads(text)
+        # first balanced object, skipping ```json fences and any chatter around it
+        parsed=json.loads(extract_json_object(text) or text)
 
         required_fields=[
             "error_category","error_type","severity",
@@ -136,29 +242,24 @@ def parse_ollama_response(response_text:str)->Dict[str,Any]:
             "parse_error":True
         }  
 
-async def analyze_failure_with_ollama(
-    failure: Dict[str, Any],
-    logs: str,
-    client
-) -> Dict[str, Any]:
-    """
-    Analyze a single failure using Ollama
-    
-    Args:
-        failure: Failure data dictionary
-        logs: Log content
-        client: Ollama client
-        
-    Returns:
-        Analysis result dictionary
-    """
+# bump when the prompt or the excerpt selection changes, so cached answers to the old prompt are not reused
+PROMPT_VERSION = "2"
+
+def analysis_excerpt(logs: str) -> str:
+    """The part of the logs the model sees: the highest-scoring error windows within the token budget."""
+    return extract_error_windows(logs, LOG_EXCERPT_TOKENS)
+
+def build_analysis_prompt(failure: Dict[str, Any], logs: str, excerpt: Optional[str] = None) -> str:
+    """Prompt for one failure; pure string work, so the pipeline runs it off the event loop."""
+    if excerpt is None:
+        excerpt = analysis_excerpt(logs)
     # Simpler, more direct prompt for small models
-    prompt = f"""Analyze this error and respond with ONLY valid JSON (no explanation):
+    return f"""Analyze this error and respond with ONLY valid JSON (no explanation):
 
 Error from: {failure.get('name', 'Unknown')} (Run #{failure.get('run_number', 'N/A')})
 
 Logs:
-{logs[:3000]}
+{excerpt}
 
 Return this exact JSON structure:
 {{
@@ -174,16 +275,45 @@ Return this exact JSON structure:
 }}
 
 JSON:"""
+
+async def analyze_failure_with_ollama(
+    failure: Dict[str, Any],
+    logs: str,
+    client,
+    prompt: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Analyze a single failure using Ollama
+    
+    Args:
+        failure: Failure data dictionary
+        logs: Log content
+        client: Ollama client (AsyncOllamaClient, or a blocking OllamaConfig)
+        prompt: Prebuilt prompt, built from the logs when omitted
+        
+    Returns:
+        Analysis result dictionary
+    """
+    if prompt is None:
+        prompt = build_analysis_prompt(failure, logs)
     
     try:
         logger.info(f"Analyzing failure #{failure.get('run_number')} with Ollama ({OLLAMA_MODEL})")
         
         # Call Ollama with simpler approach
-        response_text = client.generate(
-            prompt=prompt,
-            temperature=0.1,  # Slightly higher for creativity
-            max_tokens=1024   # Shorter for faster response
-        )
+        generate_kwargs = {
+            "temperature": 0.1,  # Slightly higher for creativity
+            "max_tokens": 1024   # Shorter for faster response
+        }
+        generation_stats = None
+        if OLLAMA_STREAM and hasattr(client, "generate_json"):
+            # stop as soon as the JSON object is complete instead of waiting for trailing chatter
+            response_text, generation_stats = await client.generate_json(prompt=prompt, **generate_kwargs)
+        elif inspect.iscoroutinefunction(client.generate):
+            response_text = await client.generate(prompt=prompt, **generate_kwargs)
+        else:
+            # blocking client (scripts): keep the event loop free while it runs
+            response_text = await asyncio.to_thread(client.generate, prompt=prompt, **generate_kwargs)
         
         logger.debug(f"Raw response: {response_text[:200]}...")
         
@@ -211,6 +341,11 @@ JSON:"""
         analysis["model_used"] = OLLAMA_MODEL
         analysis["run_id"] = failure.get("id")
         analysis["run_number"] = failure.get("run_number")
+        if generation_stats:
+            analysis["generation"] = {
+                key: round(value, 3) if isinstance(value, float) else value
+                for key, value in generation_stats.items()
+            }
         
         logger.info(
             f"Analysis complete: {analysis.get('error_category')} "
@@ -259,6 +394,68 @@ JSON:"""
             "fallback": True
         }
 
+def prepare_analysis(failure:Dict[str,Any],logs:str)->Dict[str,Any]:
+    """Prompt, analysis cache key and failure signature for one failure."""
+    excerpt=analysis_excerpt(logs)
+    return {
+        "prompt":build_analysis_prompt(failure,logs,excerpt),
+        # placeholder text says nothing about the failure; every log-less run would share its key
+        "cache_key":None if is_placeholder_logs(logs) else make_key(OLLAMA_MODEL,PROMPT_VERSION,excerpt),
+        "signature":failure_signature(logs)
+    }
+
+def _cacheable(analysis:Dict[str,Any])->bool:
+    return not (analysis.get("fallback") or analysis.get("parse_error") or analysis.get("cached"))
+
+def _failed_analysis(error:StageError)->Dict[str,Any]:
+    analysis={"error":str(error),"stage":error.stage,"analyzed_at":datetime.now().isoformat()}
+    if error.timed_out:
+        analysis["timed_out"]=True
+    return analysis
+
+def summarize_analyses(analyzed_failures:List[Dict[str,Any]])->Dict[str,Any]:
+    analysis_summary={
+        "total_analyzed":0,
+        "successful":0,
+        "failed":0,
+        "categories":{},
+        "high_confidence":0,
+        "flaky_tests":0,
+        "timed_out":0,
+        "cached":0,
+        "signatures":{}
+    }
+    for failure in analyzed_failures:
+        analysis=failure["analysis"]
+        if "error" in analysis:
+            analysis_summary["failed"]+=1
+            analysis_summary["timed_out"]+=bool(analysis.get("timed_out"))
+            continue
+
+        analysis_summary["total_analyzed"]+=1
+        fingerprint=analysis.get("signature",{}).get("fingerprint")
+        if fingerprint:
+            analysis_summary["signatures"][fingerprint]=analysis_summary["signatures"].get(fingerprint,0)+1
+
+        if analysis.get("parse_error"):
+            analysis_summary["failed"]+=1
+            continue
+
+        analysis_summary["successful"]+=1
+
+        category=analysis.get("error_category","unknown")
+        analysis_summary["categories"][category]=analysis_summary["categories"].get(category,0)+1
+
+        if analysis.get("confidence_score",0)>=0.7:
+            analysis_summary["high_confidence"]+=1
+
+        if analysis.get("is_flaky",False):
+            analysis_summary["flaky_tests"]+=1
+
+        if analysis.get("cached"):
+            analysis_summary["cached"]+=1
+    return analysis_summary
+
 async def failure_analysis_node(state:AgentState)->AgentState:
     logger.info("Starting failure analysis with Ollama")
 
@@ -282,8 +479,11 @@ async def failure_analysis_node(state:AgentState)->AgentState:
     repo=state.context.get("repo")
 
     try:
-        ollama_client=get_ollama_client()
-        github=GitHubMCP()
+        ollama_client=get_async_ollama_client()
+        await ollama_client.verify()
+        github=get_github_client()
+        log_store=get_log_store()
+        analysis_cache=get_analysis_cache() if state.context.get("use_analysis_cache",True) else None
     except Exception as e:
         error_msg=f"Failed to initialize clients: {e}"
         logger.error(error_msg)
@@ -295,68 +495,78 @@ async def failure_analysis_node(state:AgentState)->AgentState:
         }
         return state
 
-    analyzed_failures=[]
-    analysis_summary={
-        "total_analyzed":0,
-        "successful":0,
-        "failed":0,
-        "categories":{},
-        "high_confidence":0,
-        "flaky_tests":0
-    }
-    for i,failure in enumerate(detected_failures,1):
-        run_id=failure.get("id")
-        run_number=failure.get("run_number")
-
-        logger.info(f"Analyzing failure {i}/{len(detected_failures)}: Run #{run_number}")
-        state.current_task=f"Analyzing failure {i}/{len(detected_failures)} with Ollama"
-
-        try:
-            logs=await fetch_failure_logs(github, owner, repo, run_id)
-
-            analysis=await analyze_failure_with_ollama(failure,logs,ollama_client)
-
-            failure_with_analysis={
-                **failure,
-                "analysis":analysis
-            }
-            analyzed_failures.append(failure_with_analysis)
-
-            analysis_summary["total_analyzed"]+=1
-
-            if "error" not in analysis and not analysis.get("parse_error"):
-                analysis_summary["successful"]+=1
-
-                category=analysis.get("error_category","unknown")
-                analysis_summary["categories"][category] /= analysis_summary["category"].get(category,0)+1
-
-                if analysis.get("confidence_score",0)>=0.7:
-                    analysis_summary["high_confidence"]+=1
-                
-                if analysis.get("is_flaky",False):
-                    analysis_summary["flaky_tests"]+=1
-                
-            else:
-                analysis_summary["failed"]+=1
-            
-            state.memory.append(
-                f"[{timestamp}] Run #{run_number}: {analysis.get('error_category','unknown')}"
-                f"- {analysis.get('root_cause','N/A')[:60]}"
-            )
-
-        except Exception as e:
-            logger.error(f"Failed to analyze run #{run_number}: {e}")
-            analysis_summary["failed"]+=1
+    timeout=state.context.get("analysis_timeout",ANALYSIS_TIMEOUT)
+    queue_size=state.context.get("analysis_queue_size")
+
+    async def fetch(failure:Dict[str,Any])->Dict[str,Any]:
+        logs=await fetch_failure_logs(github, failure.get("owner",owner), failure.get("repo",repo), failure.get("id"), failure.get("run_attempt",1), log_store)
+        return {"failure":failure,"logs":logs}
+
+    async def preprocess(item:Dict[str,Any])->Dict[str,Any]:
+        item.update(await asyncio.to_thread(prepare_analysis,item["failure"],item["logs"]))
+        return item
+
+    # identical failures in one batch share a single Ollama call
+    coalesce=SingleFlight()
+
+    async def infer(item:Dict[str,Any])->Dict[str,Any]:
+        failure=item["failure"]
+        key=item["cache_key"]
+        analysis=analysis_cache.get(key) if analysis_cache and key else None
+
+        if analysis is None:
+            async def generate()->Dict[str,Any]:
+                logger.info(f"Analyzing failure: Run #{failure.get('run_number')}")
+                result=await analyze_failure_with_ollama(failure,item["logs"],ollama_client,prompt=item["prompt"])
+                if analysis_cache and key and _cacheable(result):
+                    analysis_cache.put(key,result,OLLAMA_MODEL)
+                return result
+
+            if key is None:
+                return {**await generate(),"signature":item["signature"]}
+            analysis=await coalesce.do(key,generate)
+            if analysis.get("run_id")==failure.get("id"):
+                return {**analysis,"signature":item["signature"]}
+            analysis={**analysis,"cached":True,"cache_key":key,"cached_from_run_id":analysis.get("run_id")}
+
+        logger.info(f"Run #{failure.get('run_number')} matches a cached analysis")
+        return {
+            **analysis,
+            "analyzed_at":datetime.now().isoformat(),
+            "run_id":failure.get("id"),
+            "run_number":failure.get("run_number"),
+            "signature":item["signature"]
+        }
 
-            analyzed_failures.append({
-                **failure,
-                "analysis":{
-                    "error":str(e),
-                    "analyzed_at":timestamp
-                }
-            })
+    # downloads keep running while Ollama works, the bounded queues stop them from racing ahead
+    pipeline=Pipeline("analysis",[
+        Stage("fetch",fetch,state.context.get("max_concurrent_log_fetches",LOG_FETCH_CONCURRENCY),queue_size,timeout),
+        Stage("preprocess",preprocess,state.context.get("max_concurrent_preprocessing",PREPROCESS_CONCURRENCY),queue_size),
+        Stage("infer",infer,state.context.get("max_concurrent_analyses",OLLAMA_NUM_PARALLEL),queue_size,timeout)
+    ],metrics=github.metrics)
+    state.current_task=f"Analyzing {len(detected_failures)} failures with Ollama ({pipeline.stages[-1].concurrency} at a time)"
+
+    # results come back in detection order, so the merge below does not depend on which item finishes first
+    results=await pipeline.run(detected_failures)
+    analyzed_failures=[
+        {**failure,"analysis":_failed_analysis(result) if isinstance(result,StageError) else result}
+        for failure,result in zip(detected_failures,results)
+    ]
+    analysis_summary=summarize_analyses(analyzed_failures)
+
+    for failure in analyzed_failures:
+        analysis=failure["analysis"]
+        if "error" in analysis:
+            continue
+        state.memory.append(
+            f"[{timestamp}] Run #{failure.get('run_number')}: {analysis.get('error_category','unknown')}"
+            f"- {analysis.get('root_cause','N/A')[:60]}"
+        )
     state.context["analyzed_failures"]=analyzed_failures
     state.context["analysis_summary"]=analysis_summary
+    state.context["analysis_pipeline"]=pipeline.summary()
+    if analysis_cache:
+        state.context["analysis_cache"]=analysis_cache.stats()
     state.context["last_analysis"]=timestamp
 
     state.status="analysis_complete"
@@ -1,16 +1,54 @@
 import logging
 import os
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from ..state import AgentState
+from ..sync_store import get_sync_store
 
 import sys
 from pathlib import Path
 
 sys.path.insert(0,str(Path(__file__).parent.parent.parent))
-from mcp_servers.github_mcp import GitHubMCP
+from mcp_servers.github_mcp import RunRecord, get_github_client
 
 logger=logging.getLogger("GitHubMonitorNode")
 
+async def fetch_failed_runs(github,owner:str,repo:str,branch:Optional[str],max_failed_runs:int,workflow_id=None,incremental:bool=False)->List[RunRecord]:
+    """Failed runs of one repo; with incremental set, only run attempts not seen by an earlier sync."""
+    if not incremental:
+        logger.info(f"Fetching failed runs for {owner}/{repo} (limit: {max_failed_runs})")
+        return [run async for run in github.iter_failed_runs(owner,repo,branch,limit=max_failed_runs,workflow_id=workflow_id)]
+
+    repo_key=f"{owner}/{repo}"
+    sync_store=get_sync_store()
+    since,until=sync_store.next_window(repo_key,branch,workflow_id)
+    logger.info(
+        f"Incremental sync of {repo_key} failed runs created {since or 'beginning'} - {until or 'now'} "
+        f"(limit: {max_failed_runs})"
+    )
+
+    returned=[
+        run async for run in github.iter_failed_runs(
+            owner,repo,branch,limit=max_failed_runs,created_since=since,created_until=until,workflow_id=workflow_id
+        )
+    ]
+    # the overlap window returns runs handled before
+    failed_runs=[run for run in returned if sync_store.is_new(repo_key,run.id,run.run_attempt)]
+    sync_store.record_runs(
+        repo_key,branch,workflow_id,returned,window=(since,until),truncated=len(returned)>=max_failed_runs
+    )
+    return failed_runs
+
+async def check_repo_activity(github,owner:str,repo:str,branch:Optional[str],workflow_id=None,fingerprints:Optional[Dict[str,str]]=None)->Tuple[bool,str,str]:
+    """
+    Pre-check before listing runs. Returns (changed, key, fingerprint); the
+    caller stores fingerprints[key]=fingerprint once the repo has been scanned.
+    """
+    key=f"{owner}/{repo}@{branch or ''}#{workflow_id or ''}"
+    fingerprint=await github.get_failed_runs_fingerprint(owner,repo,branch,workflow_id)
+    changed=fingerprints is None or fingerprints.get(key)!=fingerprint
+    return changed,key,fingerprint
+
 async def github_monitor_node(state: AgentState)->AgentState:
     logger.info("Starting GitHub workflow monitoring")
 
@@ -20,6 +58,10 @@ async def github_monitor_node(state: AgentState)->AgentState:
     owner=state.context.get("owner")
     repo=state.context.get("repo")
     max_failed_runs=state.context.get("max_failed_runs",10)
+    branch=state.context.get("branch","main")
+    workflow_id=state.context.get("workflow_id")
+    incremental=state.context.get("incremental_sync",False)
+    skip_unchanged=state.context.get("skip_unchanged_repos",True)
 
     state.context["total_checks"]=state.context.get("total_checks",0)
     check_num=state.context["total_checks"]
@@ -27,35 +69,37 @@ async def github_monitor_node(state: AgentState)->AgentState:
     timestamp=datetime.now().isoformat()
     try:
         logger.info(f"Connection to GitHub API for {owner}/{repo}")
-        github=GitHubMCP()
+        github=get_github_client()
         state.memory.append(f"[{timestamp}] Check #{check_num}: Connected to GitHub API")
         
-        logger.info(f"Fetching failed runs (limit: {max_failed_runs})")
-        failed_runs_response=await github.get_failed_runs(owner=owner,repo=repo,limit=max_failed_runs)
-
-        failed_runs=failed_runs_response.failed_runs
-        total_failures=failed_runs_response.total_count
+        fingerprints=state.context.setdefault("repo_fingerprints",{})
+        state.context["skipped_repos"]=0
+        if skip_unchanged:
+            changed,key,fingerprint=await check_repo_activity(github,owner,repo,branch,workflow_id,fingerprints)
+            if not changed:
+                logger.info(f"No new failed runs in {owner}/{repo} since last check - skipping")
+                state.context["skipped_repos"]=1
+                state.memory.append(f"[{timestamp}] Check #{check_num}: No new workflow activity, skipped")
+                state.status="complete"
+                state.current_task="No new workflow activity - monitoring complete"
+                state.context["last_check"]=timestamp
+                state.last_updated=timestamp
+                return state
+
+        failed_runs=await fetch_failed_runs(github,owner,repo,branch,max_failed_runs,workflow_id,incremental)
+        total_failures=len(failed_runs)
+        if skip_unchanged:
+            fingerprints[key]=fingerprint
         logger.info(f"Found {total_failures} total failed runs")
 
         processed_runs=state.context.get("processed_runs",set())
         new_failures=[]
 
         for run in failed_runs:
-            if run.id not in processed_runs:
-                failure_data={
-                    "id":run.id,
-                    "run_number":run.run_number,
-                    "name":run.name,
-                    "status":run.status,
-                    "conclusion":run.conclusion,
-                    "head_branch":run.head_branch,
-                    "head_sha":run.head_sha,
-                    "created_at":run.created_at,
-                    "updated_at":run.updated_at,
-                    "url":run.url
-                }
+            if (run.id,run.run_attempt) not in processed_runs:
+                failure_data=run.as_dict()
                 new_failures.append(failure_data)
-                processed_runs.add(run.id)
+                processed_runs.add((run.id,run.run_attempt))
 
                 logger.info(
                     f"New failure: Run #{run.run_number} - {run.name} "
@@ -6,7 +6,7 @@ from ..state import AgentState
 import sys
 from pathlib import Path
 sys.path.insert(0,str(Path(__file__).parent.parent.parent))
-from mcp_servers.github_mcp import GitHubMCP
+from mcp_servers.github_mcp import get_github_client
 
 logger = logging.getLogger("HealingNode")
 
@@ -41,7 +41,7 @@ async def retry_node(state: AgentState) -> AgentState:
     repo=state.context.get("repo")
 
     try:
-        github=GitHubMCP()
+        github=get_github_client()
     except Exception as e:
         error_msg=f"Failed to initialize GitHub client: {e}"
         logger.error(error_msg)
@@ -97,8 +97,8 @@ async def retry_node(state: AgentState) -> AgentState:
 
         try:
             result = await github.rerun_workflow(
-                owner=owner,
-                repo=repo,
+                owner=failure.get("owner",owner),
+                repo=failure.get("repo",repo),
                 run_id=run_id,
                 failed_jobs_only=True
             )
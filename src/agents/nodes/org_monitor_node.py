@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from ..state import AgentState
+from .github_monitor_node import check_repo_activity, fetch_failed_runs
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0,str(Path(__file__).parent.parent.parent))
+from mcp_servers.github_mcp import RepoSummary, get_github_client
+
+logger=logging.getLogger("OrgMonitorNode")
+
+async def _scan_repo(github,repo:RepoSummary,context:Dict[str,Any],semaphore:asyncio.Semaphore)->Optional[List[Dict[str,Any]]]:
+    """Failures of one repo, or None when the pre-check found no new activity."""
+    branch=context.get("branch") or repo.default_branch
+    workflow_id=context.get("workflow_id")
+    skip_unchanged=context.get("skip_unchanged_repos",True)
+    fingerprints=context.setdefault("repo_fingerprints",{})
+    async with semaphore:
+        if skip_unchanged:
+            changed,key,fingerprint=await check_repo_activity(github,repo.owner,repo.name,branch,workflow_id,fingerprints)
+            if not changed:
+                return None
+        failed_runs=await fetch_failed_runs(
+            github,
+            repo.owner,
+            repo.name,
+            branch,
+            context.get("max_failed_runs",10),
+            workflow_id,
+            context.get("incremental_sync",False)
+        )
+        if skip_unchanged:
+            fingerprints[key]=fingerprint
+    return [{**run.as_dict(),"owner":repo.owner,"repo":repo.name} for run in failed_runs]
+
+async def org_monitor_node(state:AgentState)->AgentState:
+    """
+    Sweep every active repository of state.context["org"] for failed runs.
+
+    Repos are discovered once per sweep (skipping archived ones, repos without
+    Actions and repos not pushed within repo_pushed_within_days), then scanned
+    concurrently, max_concurrent_repos at a time, on the shared GitHub client.
+    Repos whose failed-run list has not changed since the previous sweep are
+    skipped after a single cheap request (see check_repo_activity).
+    Failures from all repos land in detected_failures tagged with owner/repo;
+    per-repo counts and errors go to context["org_report"].
+    """
+    logger.info("Starting organization-wide workflow monitoring")
+
+    state.status="monitoring"
+    state.current_task="Monitoring organization workflows for failures"
+
+    org=state.context["org"]
+    pushed_within_days=state.context.get("repo_pushed_within_days",7)
+    max_concurrent_repos=state.context.get("max_concurrent_repos",8)
+
+    state.context["total_checks"]=state.context.get("total_checks",0)
+    check_num=state.context["total_checks"]
+
+    timestamp=datetime.now().isoformat()
+    started=time.perf_counter()
+    try:
+        github=get_github_client()
+        pushed_since=None
+        if pushed_within_days:
+            pushed_since=(datetime.now(timezone.utc)-timedelta(days=pushed_within_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        repos=await github.list_repositories(org,pushed_since=pushed_since)
+        logger.info(f"Monitoring {len(repos)} repositories in {org}")
+
+        semaphore=asyncio.Semaphore(max_concurrent_repos)
+        results=await asyncio.gather(
+            *(_scan_repo(github,repo,state.context,semaphore) for repo in repos),
+            return_exceptions=True
+        )
+
+        processed_runs=state.context.get("processed_runs",set())
+        new_failures=[]
+        failures_by_repo={}
+        errors={}
+        skipped=0
+        for repo,result in zip(repos,results):
+            if isinstance(result,BaseException):
+                logger.warning(f"Failed to scan {repo.full_name}: {result}")
+                errors[repo.full_name]=str(result)
+                continue
+            if result is None:
+                skipped+=1
+                continue
+            if result:
+                failures_by_repo[repo.full_name]=len(result)
+            for failure in result:
+                if (failure["id"],failure["run_attempt"]) not in processed_runs:
+                    processed_runs.add((failure["id"],failure["run_attempt"]))
+                    new_failures.append(failure)
+
+        state.context["processed_runs"]=processed_runs
+        state.context["skipped_repos"]=skipped
+        state.context.setdefault("detected_failures",[]).extend(new_failures)
+        state.context["org_report"]={
+            "org":org,
+            "repos_scanned":len(repos),
+            "repos_skipped":skipped,
+            "repos_with_failures":len(failures_by_repo),
+            "total_failures":sum(failures_by_repo.values()),
+            "new_failures":len(new_failures),
+            "failures_by_repo":dict(sorted(failures_by_repo.items(),key=lambda item:-item[1])),
+            "errors":errors,
+            "duration_seconds":round(time.perf_counter()-started,2)
+        }
+
+        state.memory.append(
+            f"[{timestamp}] Check #{check_num}: Swept {len(repos)} repos in {org} - "
+            f"{len(new_failures)} new failed runs across {len(failures_by_repo)} repos"
+        )
+        if new_failures:
+            state.current_task=f"Processing {len(new_failures)} newly detected failures"
+        else:
+            state.status="complete"
+            state.current_task="No new failures detected - monitoring complete"
+
+        state.context["last_check"]=timestamp
+        state.context["last_failure_count"]=state.context["org_report"]["total_failures"]
+        state.last_updated=timestamp
+
+        logger.info(
+            f"Org sweep #{check_num} complete in {state.context['org_report']['duration_seconds']}s - "
+            f"Repos:{len(repos)}, Skipped:{skipped}, New:{len(new_failures)}, Errors:{len(errors)}"
+        )
+
+    except Exception as e:
+        logger.error(f"Error during organization monitoring: {e}",exc_info=True)
+
+        state.status="error"
+        state.current_task=f"Error occurred: {str(e)}"
+        state.memory.append(f"[{timestamp}] ERROR: {str(e)}")
+
+        state.context["last_error"]={
+            "message":str(e),
+            "timestamp":timestamp,
+            "check_number":check_num
+        }
+    return state
@@ -12,7 +12,8 @@ def start_node(state:AgentState)->AgentState:
 
     timestamp=datetime.now().isoformat()
     state.memory.append(f"[{timestamp}] Agent initialized - Role: {state.role}")
-    required_keys=["owner","repo"]
+    # org mode sweeps every active repo of the org instead of a single repo
+    required_keys=["org"] if "org" in state.context else ["owner","repo"]
     missing_keys=[key for key in required_keys if key not in state.context]
 
     if missing_keys:
@@ -29,6 +30,12 @@ def start_node(state:AgentState)->AgentState:
     if "max_failed_runs" not in state.context:
         state.context["max_failed_runs"]=10
         logger.info("Set default max_failed_runs: 10")
+
+    if "incremental_sync" not in state.context:
+        state.context["incremental_sync"]=False
+
+    if "skip_unchanged_repos" not in state.context:
+        state.context["skip_unchanged_repos"]=True
     
     state.context["monitoring_started_at"]=timestamp
     state.context["total_checks"]=0
@@ -41,7 +48,10 @@ def start_node(state:AgentState)->AgentState:
         "Detect failures",
         "Analyze error logs"
     ]
-    repo_full_name=f"{state.context['owner']}/{state.context['repo']}"
+    if "org" in state.context:
+        repo_full_name=f"all active repositories of {state.context['org']}"
+    else:
+        repo_full_name=f"{state.context['owner']}/{state.context['repo']}"
     logger.info(f"Montoring repository: {repo_full_name}")
     logger.info(f"Monitoring interval: {state.context['monitoring_interval']}s")
     logger.info(f"Max failed runs to check: {state.context['max_failed_runs']}")
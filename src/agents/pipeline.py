@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger=logging.getLogger("Pipeline")
+
+_DONE=object()
+
+class StageError(Exception):
+    """An item failed (or timed out) in a stage; the stages after it are skipped for that item."""
+
+    def __init__(self,stage:str,message:str,timed_out:bool=False):
+        super().__init__(f"{stage} stage: {message}")
+        self.stage=stage
+        self.timed_out=timed_out
+
+class Stage:
+    """
+    One step of a Pipeline: an async function applied to every item by
+    `concurrency` workers, fed from a queue holding at most `queue_size` items.
+    """
+
+    def __init__(
+        self,
+        name:str,
+        fn:Callable[[Any],Awaitable[Any]],
+        concurrency:int=1,
+        queue_size:Optional[int]=None,
+        timeout:Optional[float]=None
+    ):
+        self.name=name
+        self.fn=fn
+        self.concurrency=max(1,concurrency)
+        # two items per worker keeps the stage busy while its input stays bounded
+        self.queue_size=queue_size or 2*self.concurrency
+        self.timeout=timeout
+
+class Pipeline:
+    """
+    Runs items through a chain of stages connected by bounded asyncio queues.
+
+    Every stage works on different items at the same time, so log downloads
+    overlap with inference instead of alternating with it. A full queue
+    blocks the stage in front of it, which caps the number of items in
+    memory and lets the slowest stage set the pace. Results come back in
+    input order; an item that fails a stage yields a StageError in its slot.
+
+    With a metrics registry (mcp_servers.metrics.MetricsRegistry) queue depth,
+    in-flight items, per-stage latency and queue wait are exported under
+    pipeline_*; the same figures are kept in `stats` for summary().
+    """
+
+    def __init__(self,name:str,stages:List[Stage],metrics=None):
+        if not stages:
+            raise ValueError("a pipeline needs at least one stage")
+        self.name=name
+        self.stages=stages
+        self.elapsed=0.0
+        self.stats:Dict[str,Dict[str,Any]]={
+            stage.name:{
+                "concurrency":stage.concurrency,
+                "queue_size":stage.queue_size,
+                "processed":0,
+                "failed":0,
+                "timed_out":0,
+                "in_flight":0,
+                "max_queue_depth":0,
+                "busy_seconds":0.0,
+                "wait_seconds":0.0
+            }
+            for stage in stages
+        }
+
+        self.metrics=metrics
+        if metrics is not None:
+            self.m_depth=metrics.gauge("pipeline_queue_depth","Items waiting in front of a pipeline stage")
+            self.m_in_flight=metrics.gauge("pipeline_stage_in_flight","Items a pipeline stage is working on")
+            self.m_items=metrics.counter("pipeline_stage_items_total","Items through a pipeline stage by outcome")
+            self.m_duration=metrics.histogram("pipeline_stage_duration_seconds","Time a pipeline stage spent on one item")
+            self.m_wait=metrics.histogram("pipeline_queue_wait_seconds","Time an item waited in a pipeline stage's queue")
+
+    def _observe_depth(self,stage:Stage,queue:asyncio.Queue)->None:
+        stats=self.stats[stage.name]
+        stats["max_queue_depth"]=max(stats["max_queue_depth"],queue.qsize())
+        if self.metrics is not None:
+            self.m_depth.set(queue.qsize(),pipeline=self.name,stage=stage.name)
+
+    def _observe_in_flight(self,stage:Stage,delta:int)->None:
+        stats=self.stats[stage.name]
+        stats["in_flight"]+=delta
+        if self.metrics is not None:
+            self.m_in_flight.set(stats["in_flight"],pipeline=self.name,stage=stage.name)
+
+    async def _process(self,stage:Stage,value:Any,waited:float)->Any:
+        stats=self.stats[stage.name]
+        stats["wait_seconds"]+=waited
+        self._observe_in_flight(stage,1)
+        start=time.perf_counter()
+        outcome="ok"
+        try:
+            if stage.timeout:
+                return await asyncio.wait_for(stage.fn(value),stage.timeout)
+            return await stage.fn(value)
+        except asyncio.TimeoutError:
+            outcome="timeout"
+            stats["timed_out"]+=1
+            return StageError(stage.name,f"timed out after {stage.timeout}s",timed_out=True)
+        except Exception as e:
+            outcome="error"
+            stats["failed"]+=1
+            logger.error(f"{self.name}/{stage.name} failed: {e}")
+            return StageError(stage.name,str(e) or type(e).__name__)
+        finally:
+            duration=time.perf_counter()-start
+            stats["processed"]+=1
+            stats["busy_seconds"]+=duration
+            self._observe_in_flight(stage,-1)
+            if self.metrics is not None:
+                labels={"pipeline":self.name,"stage":stage.name}
+                self.m_items.inc(outcome=outcome,**labels)
+                self.m_duration.observe(duration,**labels)
+                self.m_wait.observe(waited,**labels)
+
+    async def run(self,items:Iterable[Any])->List[Any]:
+        items=list(items)
+        results:List[Any]=[None]*len(items)
+        queues=[asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        running=[stage.concurrency for stage in self.stages]
+        last=len(self.stages)-1
+
+        async def put(i:int,entry)->None:
+            await queues[i].put(entry)
+            self._observe_depth(self.stages[i],queues[i])
+
+        async def feed()->None:
+            for index,item in enumerate(items):
+                await put(0,(index,item,time.perf_counter()))
+            for _ in range(self.stages[0].concurrency):
+                await queues[0].put(_DONE)
+
+        async def work(i:int)->None:
+            stage=self.stages[i]
+            while True:
+                entry=await queues[i].get()
+                self._observe_depth(stage,queues[i])
+                if entry is _DONE:
+                    break
+
+                index,value,enqueued=entry
+                value=await self._process(stage,value,time.perf_counter()-enqueued)
+                if i==last or isinstance(value,StageError):
+                    results[index]=value
+                else:
+                    await put(i+1,(index,value,time.perf_counter()))
+
+            # the last worker of a stage to finish closes the next stage
+            running[i]-=1
+            if running[i]==0 and i<last:
+                for _ in range(self.stages[i+1].concurrency):
+                    await queues[i+1].put(_DONE)
+
+        start=time.perf_counter()
+        tasks=[asyncio.create_task(feed())]
+        for i,stage in enumerate(self.stages):
+            tasks.extend(asyncio.create_task(work(i)) for _ in range(stage.concurrency))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.elapsed+=time.perf_counter()-start
+        return results
+
+    def summary(self)->Dict[str,Any]:
+        """Per-stage counts, queue high-water marks and utilization (busy time over worker time)."""
+        stages={}
+        for stage in self.stages:
+            stats=self.stats[stage.name]
+            worker_seconds=self.elapsed*stage.concurrency
+            stages[stage.name]={
+                **{key:value for key,value in stats.items() if key!="in_flight"},
+                "busy_seconds":round(stats["busy_seconds"],3),
+                "wait_seconds":round(stats["wait_seconds"],3),
+                "utilization":round(stats["busy_seconds"]/worker_seconds,3) if worker_seconds else 0.0
+            }
+        return {"elapsed_seconds":round(self.elapsed,3),"stages":stages}
@@ -0,0 +1,181 @@
+import os
+import sqlite3
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Iterable, Tuple
+
+logger=logging.getLogger("SyncStore")
+
+DEFAULT_SYNC_STORE_PATH=".agent_state/sync.db"
+# GitHub-hosted jobs are cancelled after 6 hours, so a run fails at most that long after it was created
+DEFAULT_SYNC_OVERLAP=6*3600
+SCHEMA_VERSION=3
+
+def _parse_timestamp(value:str)->datetime:
+    return datetime.fromisoformat(value.replace("Z","+00:00"))
+
+def _format_timestamp(value:datetime)->str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class SyncCursorStore:
+    """
+    Persisted high-water marks for incremental failed-run sync.
+
+    A cursor is kept per (repo, branch, workflow) holding the newest run
+    created_at seen so far. A run only shows up as failed once it completes,
+    which can be long after it was created, so the next cycle asks GitHub for
+    runs created since the cursor minus an overlap window (SYNC_OVERLAP
+    seconds, the longest a run is expected to take) rather than since the
+    cursor itself.
+
+    The overlap returns runs that were already handled; those are filtered out
+    by seen_runs, which remembers every (run id, run attempt) synced. A re-run
+    is a new attempt and counts as new. Entries created before the window can
+    never be returned again and are pruned as the cursor advances.
+
+    A sync returns at most max_failed_runs runs, newest first. When it is cut
+    short the rest of its window is kept as a pending range (window start up
+    to the oldest run returned) and the following syncs page through that range
+    instead, until a sync comes back short. Newer failures wait until the range
+    is drained. The very first sync has no window start: it reports the newest
+    runs and does not backfill the history before them.
+    """
+
+    def __init__(self,path:Optional[str]=None,overlap:Optional[float]=None):
+        self.path=path or os.getenv("SYNC_STORE_PATH",DEFAULT_SYNC_STORE_PATH)
+        self.overlap=overlap if overlap is not None else float(os.getenv("SYNC_OVERLAP",DEFAULT_SYNC_OVERLAP))
+        directory=os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory,exist_ok=True)
+
+        self._conn=sqlite3.connect(self.path)
+        version=self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version<2:
+            # seen_runs used to be keyed by run id alone; start the sync over rather than miss re-attempts
+            logger.info(f"Resetting sync state in {self.path} for schema version {SCHEMA_VERSION}")
+            self._conn.executescript("DROP TABLE IF EXISTS cursors; DROP TABLE IF EXISTS seen_runs;")
+        elif version==2:
+            self._conn.executescript("""
+                ALTER TABLE cursors ADD COLUMN pending_since TEXT;
+                ALTER TABLE cursors ADD COLUMN pending_until TEXT;
+            """)
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS cursors(
+                repo TEXT NOT NULL,
+                branch TEXT NOT NULL,
+                workflow TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                synced_at TEXT NOT NULL,
+                pending_since TEXT,
+                pending_until TEXT,
+                PRIMARY KEY (repo,branch,workflow)
+            );
+            CREATE TABLE IF NOT EXISTS seen_runs(
+                repo TEXT NOT NULL,
+                run_id INTEGER NOT NULL,
+                run_attempt INTEGER NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (repo,run_id,run_attempt)
+            );
+            CREATE INDEX IF NOT EXISTS seen_runs_created_at ON seen_runs(repo,created_at);
+            PRAGMA user_version={SCHEMA_VERSION};
+        """)
+        self._conn.commit()
+
+    def get_cursor(self,repo:str,branch:Optional[str],workflow:Optional[Any]=None)->Optional[Dict[str,str]]:
+        row=self._conn.execute(
+            "SELECT created_at,synced_at,pending_since,pending_until FROM cursors WHERE repo=? AND branch=? AND workflow=?",
+            (repo,branch or "",str(workflow or ""))
+        ).fetchone()
+        if row is None:
+            return None
+        return {"created_at":row[0],"synced_at":row[1],"pending_since":row[2],"pending_until":row[3]}
+
+    def next_window(self,repo:str,branch:Optional[str],workflow:Optional[Any]=None)->Tuple[Optional[str],Optional[str]]:
+        """
+        (created since, created until) bounds for the next sync: the pending
+        range while one is left, otherwise the cursor minus the overlap window
+        onwards. (None, None) before the first sync.
+        """
+        cursor=self.get_cursor(repo,branch,workflow)
+        if cursor is None:
+            return None,None
+        if cursor["pending_until"]:
+            return cursor["pending_since"],cursor["pending_until"]
+        return self._window_start(cursor["created_at"]),None
+
+    def _window_start(self,created_at:str)->str:
+        return _format_timestamp(_parse_timestamp(created_at)-timedelta(seconds=self.overlap))
+
+    def is_new(self,repo:str,run_id:int,run_attempt:int)->bool:
+        row=self._conn.execute(
+            "SELECT 1 FROM seen_runs WHERE repo=? AND run_id=? AND run_attempt=?",
+            (repo,run_id,run_attempt)
+        ).fetchone()
+        return row is None
+
+    def record_runs(
+        self,
+        repo:str,
+        branch:Optional[str],
+        workflow:Optional[Any],
+        runs:Iterable[Any],
+        window:Tuple[Optional[str],Optional[str]]=(None,None),
+        truncated:bool=False
+    )->None:
+        """
+        Mark the run attempts a sync of window returned as handled, advance the
+        cursor past the newest of them and prune what fell out of every window.
+        With truncated set the sync hit its limit, and the part of the window
+        below the oldest returned run is left pending.
+        """
+        runs=list(runs)
+        key=(repo,branch or "",str(workflow or ""))
+
+        cursor=self.get_cursor(repo,branch,workflow)
+        created_at=cursor["created_at"] if cursor else ""
+        for run in runs:
+            # ISO-8601 UTC timestamps from GitHub compare correctly as strings
+            created_at=max(created_at,run.created_at)
+
+        pending_since=pending_until=None
+        if truncated and runs and window[0] is not None:
+            # inclusive: runs sharing the oldest timestamp come back and are filtered by seen_runs
+            pending_since,pending_until=window[0],min(run.created_at for run in runs)
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_runs(repo,run_id,run_attempt,created_at) VALUES (?,?,?,?)",
+                [(repo,run.id,run.run_attempt,run.created_at) for run in runs]
+            )
+            if created_at:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cursors(repo,branch,workflow,created_at,synced_at,pending_since,pending_until) VALUES (?,?,?,?,?,?,?)",
+                    (*key,created_at,datetime.now().isoformat(),pending_since,pending_until)
+                )
+            self._prune(repo)
+
+    def _prune(self,repo:str)->None:
+        # seen_runs is shared by every cursor of the repo: keep whatever the oldest window can still return
+        rows=self._conn.execute("SELECT created_at,pending_since FROM cursors WHERE repo=?",(repo,)).fetchall()
+        if not rows:
+            return
+        horizon=min(pending_since or self._window_start(created_at) for created_at,pending_since in rows)
+        pruned=self._conn.execute(
+            "DELETE FROM seen_runs WHERE repo=? AND created_at<?",(repo,horizon)
+        ).rowcount
+        if pruned:
+            logger.debug(f"Pruned {pruned} synced runs of {repo} created before {horizon}")
+
+    def close(self)->None:
+        self._conn.close()
+
+_store: Optional[SyncCursorStore]=None
+
+def get_sync_store()->SyncCursorStore:
+    global _store
+
+    if _store is None:
+        _store=SyncCursorStore()
+
+    return _store
@@ -0,0 +1,93 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0,str(Path(__file__).parent.parent))
+
+from src.agents.load_test import _free_port,_configure_env
+
+PORT=_free_port()
+# the shared GitHub client reads its base URL on first use
+_configure_env(PORT)
+
+from src.agents.state import AgentState
+from src.agents.nodes.github_monitor_node import github_monitor_node
+from mcp_servers.fake_github import FakeGitHub
+from mcp_servers.workload import Workload,FLAKY_CATEGORIES
+
+OWNER="acme"
+REPO="service-000"
+
+def make_state()->AgentState:
+    return AgentState(
+        id="agent-test-monitor",
+        name="Monitor Test",
+        role="monitor_and_debug",
+        status="running",
+        memory=[],
+        goals=[],
+        current_task=None,
+        sub_tasks=[],
+        context={
+            "owner":OWNER,
+            "repo":REPO,
+            "branch":"main",
+            "max_failed_runs":10,
+            "skip_unchanged_repos":True,
+            "processed_runs":set()
+        },
+        last_updated=""
+    )
+
+async def check(state:AgentState)->list:
+    state.context["detected_failures"]=[]
+    state=await github_monitor_node(state)
+    assert state.status!="error",state.context.get("last_error")
+    return [(failure["id"],failure["run_attempt"]) for failure in state.context["detected_failures"]]
+
+async def test_rerun_of_older_run():
+    print("\n"+"="*60)
+    print("GITHUB MONITOR - RE-ATTEMPT OF AN OLDER FAILED RUN")
+    print("="*60+"\n")
+
+    workload=Workload(owner=OWNER,repos=1,runs_per_repo=30,failure_rate=0.5,seed=11)
+    fake=FakeGitHub(workload)
+    await fake.start(port=PORT)
+    try:
+        state=make_state()
+        detected=await check(state)
+        print(f"First check: {len(detected)} failed runs")
+        assert detected
+
+        detected=await check(state)
+        print(f"Second check: skipped={state.context['skipped_repos']}, {len(detected)} new")
+        assert state.context["skipped_repos"]==1 and detected==[]
+
+        # not the newest failure: its id and the list's total count stay the same
+        failed=[
+            run for run in workload.runs[f"{OWNER}/{REPO}"]
+            if run["conclusion"]=="failure" and run["head_branch"]=="main"
+        ]
+        older=next(run for run in failed[1:] if run["_category"] not in FLAKY_CATEGORIES)
+        workload.rerun(older["id"])
+        assert older["conclusion"]=="failure" and older["run_attempt"]==2
+
+        detected=await check(state)
+        print(f"After re-running run {older['id']}: skipped={state.context['skipped_repos']}, new {detected}")
+        assert state.context["skipped_repos"]==0
+        assert detected==[(older["id"],2)]
+
+        detected=await check(state)
+        print(f"Check after that: skipped={state.context['skipped_repos']}, {len(detected)} new")
+        assert state.context["skipped_repos"]==1 and detected==[]
+    finally:
+        await fake.stop()
+
+    print("\n"+"="*60)
+    print("TESTS COMPLETE")
+    print("="*60+"\n")
+
+if __name__=="__main__":
+    asyncio.run(test_rerun_of_older_run())
+
+#python -m src.agents.test_monitor
@@ -0,0 +1,173 @@
+import asyncio
+import glob
+import hmac
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,str(Path(__file__).parent.parent))
+
+from src.agents import webhook_server
+from src.agents.state import AgentState
+from src.agents.webhook_server import WebhookReceiver,_analyze_batch
+from mcp_servers.fake_github import FakeGitHub
+from mcp_servers.workload import Workload,FLAKY_CATEGORIES
+
+PAYLOAD_DIR=os.path.join(os.path.dirname(os.path.abspath(__file__)),"webhook_payloads")
+SECRET="test-webhook-secret"
+
+def load_recorded_payloads(directory:str=PAYLOAD_DIR)->list:
+    recorded=[]
+    for path in sorted(glob.glob(os.path.join(directory,"*.json"))):
+        with open(path) as f:
+            recorded.append(json.load(f))
+    return recorded
+
+async def replay(client:httpx.AsyncClient,url:str,recorded:dict,secret:str=SECRET)->httpx.Response:
+    body=json.dumps(recorded["payload"]).encode()
+    signature="sha256="+hmac.new(secret.encode(),body,hashlib.sha256).hexdigest()
+    return await client.post(url,content=body,headers={
+        "Content-Type":"application/json",
+        "X-GitHub-Event":recorded["event"],
+        "X-GitHub-Delivery":recorded["delivery"],
+        "X-Hub-Signature-256":signature
+    })
+
+async def fake_run_event(fake_client:httpx.AsyncClient,full_name:str,run_id:int,delivery:str)->dict:
+    """A workflow_run "completed" delivery built from the fake API's view of the run."""
+    run=(await fake_client.get(f"/repos/{full_name}/actions/runs/{run_id}")).json()
+    repository=(await fake_client.get(f"/repos/{full_name}")).json()
+    return {
+        "event":"workflow_run",
+        "delivery":delivery,
+        "payload":{"action":"completed","workflow_run":run,"repository":repository}
+    }
+
+def make_state()->AgentState:
+    return AgentState(
+        id="agent-test-webhook",
+        name="Webhook Test",
+        role="monitor_and_debug",
+        status="running",
+        memory=[],
+        goals=[],
+        current_task=None,
+        sub_tasks=[],
+        context={"processed_runs":set()},
+        last_updated=""
+    )
+
+async def test_webhook_replay():
+    print("\n"+"="*60)
+    print("WEBHOOK RECEIVER - RECORDED PAYLOAD REPLAY")
+    print("="*60+"\n")
+
+    print("Refuses to start without a secret")
+    try:
+        WebhookReceiver(secret="",allow_unsigned=False)
+        raise AssertionError("WebhookReceiver started without a secret")
+    except ValueError as e:
+        print(f" {e}")
+
+    receiver=WebhookReceiver(secret=SECRET,queue_size=10)
+    server=receiver.create_server(port=0)
+    server_task=asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    port=server.servers[0].sockets[0].getsockname()[1]
+    url=f"http://127.0.0.1:{port}/webhook"
+    recorded=load_recorded_payloads()
+
+    workload=Workload(repos=1,runs_per_repo=20,failure_rate=0.5,seed=7)
+    fake=FakeGitHub(workload)
+    fake_url=await fake.start()
+
+    try:
+        async with httpx.AsyncClient() as client:
+            print("\nReplaying recorded deliveries")
+            # a failed job is only a hint, the completed run event queues run 9001; success and in-progress are ignored
+            expected={"d-0001":"pong","d-0002":"noted","d-0003":"queued"}
+            for item in recorded:
+                response=await replay(client,url,item)
+                print(f" {item['event']:<14} {item['delivery']}: {response.status_code} {response.json()}")
+                assert response.json()["status"]==expected.get(item["delivery"],"ignored"),item["delivery"]
+
+            print("\nRedelivery of the same delivery id")
+            response=await replay(client,url,recorded[-1])
+            print(f" {response.status_code} {response.json()}")
+            assert response.json()=={"status":"duplicate delivery"}
+
+            print("\nBad signature")
+            response=await replay(client,url,dict(recorded[2],delivery="d-bad"),secret="wrong-secret")
+            print(f" {response.status_code} {response.json()}")
+            assert response.status_code==401
+
+            batch=await receiver.next_batch(window=0.1,timeout=1.0)
+            print(f"\nQueued failures: {len(batch)} (only the completed run event for run 9001)")
+            assert [(failure["id"],failure["run_attempt"]) for failure in batch]==[(9001,1)]
+            assert batch[0]["run_number"]==42
+            assert receiver.stats["queued"]==1 and receiver.stats["hints"]==1 and receiver.stats["rejected"]==1
+
+            print("\nRe-attempt of a failed run (FakeGitHub)")
+            full_name=workload.repos[0]["full_name"]
+            run=next(
+                run for run in workload.runs[full_name]
+                if run["conclusion"]=="failure" and run["_category"] not in FLAKY_CATEGORIES
+            )
+            async with httpx.AsyncClient(base_url=fake_url,headers={"Authorization":"Bearer test"}) as fake_client:
+                first=await fake_run_event(fake_client,full_name,run["id"],"d-fake-1")
+                response=await replay(client,url,first)
+                print(f" attempt 1: {response.status_code} {response.json()}")
+                assert response.status_code==202
+
+                response=await replay(client,url,dict(first,delivery="d-fake-1-again"))
+                print(f" attempt 1, new delivery id: {response.status_code} {response.json()}")
+                assert response.json()=={"status":"ignored"}
+
+                assert (await fake_client.post(f"/repos/{full_name}/actions/runs/{run['id']}/rerun")).status_code==201
+                second=await fake_run_event(fake_client,full_name,run["id"],"d-fake-2")
+                assert second["payload"]["workflow_run"]["run_attempt"]==2
+                response=await replay(client,url,second)
+                print(f" attempt 2: {response.status_code} {response.json()}")
+                assert response.status_code==202
+
+            batch=await receiver.next_batch(window=0.1,timeout=1.0)
+            attempts=[(failure["id"],failure["run_attempt"]) for failure in batch]
+            print(f" Queued: {attempts}")
+            assert attempts==[(run["id"],1),(run["id"],2)]
+
+        print("\nAnalysis dedupe per run attempt")
+        analyzed=[]
+
+        async def record_analysis(state:AgentState)->AgentState:
+            analyzed.extend((failure["id"],failure["run_attempt"]) for failure in state.context["detected_failures"])
+            return state
+
+        analysis_node=webhook_server.failure_analysis_node
+        webhook_server.failure_analysis_node=record_analysis
+        try:
+            state=await _analyze_batch(make_state(),batch)
+            state=await _analyze_batch(state,batch)
+        finally:
+            webhook_server.failure_analysis_node=analysis_node
+        print(f" Analyzed: {analyzed}")
+        assert analyzed==attempts
+        assert state.context["processed_runs"]=={(run["id"],1),(run["id"],2)}
+        print(f"\nReceiver stats: {receiver.stats}")
+    finally:
+        await fake.stop()
+        server.should_exit=True
+        await server_task
+
+    print("\n"+"="*60)
+    print("TESTS COMPLETE")
+    print("="*60+"\n")
+
+if __name__=="__main__":
+    asyncio.run(test_webhook_replay())
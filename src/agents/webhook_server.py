@@ -0,0 +1,316 @@
+import asyncio
+import hmac
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from .state import AgentState
+from .nodes.start_node import start_node
+from .nodes.github_monitor_node import github_monitor_node
+from .nodes.analysis_node import failure_analysis_node
+from mcp_servers.github_mcp import get_github_client
+
+logger=logging.getLogger("WebhookServer")
+
+MAX_REMEMBERED_DELIVERIES=10_000
+DEFAULT_WEBHOOK_HOST="127.0.0.1"
+
+def verify_signature(secret:str,body:bytes,signature_header:Optional[str])->bool:
+    """Check GitHub's X-Hub-Signature-256 header (HMAC-SHA256 of the raw body)."""
+    if not signature_header or not signature_header.startswith("sha256="):
+        return False
+    expected=hmac.new(secret.encode(),body,hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected,signature_header[len("sha256="):])
+
+def failure_from_event(event:str,payload:Dict[str,Any])->Optional[Dict[str,Any]]:
+    """Turn a completed, failed workflow_run / workflow_job event into a detected failure record."""
+    if payload.get("action")!="completed":
+        return None
+
+    repository=payload.get("repository",{})
+    owner=repository.get("owner",{}).get("login")
+    repo=repository.get("name")
+
+    if event=="workflow_run":
+        run=payload.get("workflow_run",{})
+        if run.get("conclusion")!="failure":
+            return None
+        return {
+            "owner":owner,
+            "repo":repo,
+            "id":run["id"],
+            "run_number":run.get("run_number"),
+            "run_attempt":run.get("run_attempt",1),
+            "name":run.get("name"),
+            "status":run.get("status"),
+            "conclusion":run.get("conclusion"),
+            "head_branch":run.get("head_branch"),
+            "head_sha":run.get("head_sha"),
+            "created_at":run.get("created_at"),
+            "updated_at":run.get("updated_at"),
+            "url":run.get("html_url"),
+            "source":"webhook"
+        }
+
+    if event=="workflow_job":
+        # job events arrive before the run completes: an early hint, not the full set of failed jobs
+        job=payload.get("workflow_job",{})
+        if job.get("conclusion")!="failure":
+            return None
+        return {
+            "owner":owner,
+            "repo":repo,
+            "id":job["run_id"],
+            "run_number":None,
+            "run_attempt":job.get("run_attempt",1),
+            "name":job.get("workflow_name") or job.get("name"),
+            "status":job.get("status"),
+            "conclusion":job.get("conclusion"),
+            "head_branch":job.get("head_branch"),
+            "head_sha":job.get("head_sha"),
+            "created_at":job.get("created_at"),
+            "updated_at":job.get("completed_at"),
+            "url":job.get("html_url"),
+            "source":"webhook"
+        }
+
+    return None
+
+class WebhookReceiver:
+    """
+    HTTP endpoint for GitHub workflow_run / workflow_job webhooks.
+
+    Deliveries are signature-checked, deduplicated per delivery id and per run
+    attempt, and failed runs are pushed onto a bounded queue. When the queue is
+    full the delivery is answered with 503 and dropped; the polling
+    reconciliation picks the run up later.
+
+    Only a completed workflow_run queues an attempt: a failed workflow_job
+    arrives while other jobs of the attempt may still be running (and failing),
+    so it is just counted and logged as an early hint.
+
+    A secret is required: without one anybody who can reach the endpoint can
+    queue analyses. Unsigned deliveries are only accepted with
+    allow_unsigned=True or WEBHOOK_ALLOW_UNSIGNED=true, meant for local testing.
+    """
+
+    def __init__(
+        self,
+        secret:Optional[str]=None,
+        queue_size:int=1000,
+        path:str="/webhook",
+        allow_unsigned:Optional[bool]=None
+    ):
+        self.secret=secret if secret is not None else os.getenv("GITHUB_WEBHOOK_SECRET")
+        if allow_unsigned is None:
+            allow_unsigned=os.getenv("WEBHOOK_ALLOW_UNSIGNED","false").lower() in ("1","true","yes")
+        if not self.secret:
+            if not allow_unsigned:
+                raise ValueError(
+                    "GITHUB_WEBHOOK_SECRET is not set. Set it to the webhook's secret, "
+                    "or set WEBHOOK_ALLOW_UNSIGNED=true to accept unsigned deliveries"
+                )
+            logger.warning("No webhook secret and unsigned deliveries allowed - signatures are NOT verified")
+
+        self.queue:asyncio.Queue=asyncio.Queue(maxsize=queue_size)
+        self._deliveries:"OrderedDict[str,None]"=OrderedDict()
+        self._queued_runs:"OrderedDict[Tuple[int,int],None]"=OrderedDict()
+        self.stats={"received":0,"rejected":0,"queued":0,"hints":0,"ignored":0,"dropped":0}
+
+        self.app=Starlette(routes=[
+            Route(path,self.handle,methods=["POST"]),
+            Route("/health",self.health,methods=["GET"]),
+            Route("/metrics",self.metrics,methods=["GET"])
+        ])
+
+    @staticmethod
+    def _remember(seen:OrderedDict,key)->bool:
+        """Record key; returns False if it was already seen."""
+        if key in seen:
+            return False
+        seen[key]=None
+        if len(seen)>MAX_REMEMBERED_DELIVERIES:
+            seen.popitem(last=False)
+        return True
+
+    async def health(self,request:Request)->JSONResponse:
+        return JSONResponse({"status":"ok","queue_depth":self.queue.qsize(),**self.stats})
+
+    async def metrics(self,request:Request)->PlainTextResponse:
+        """GitHub API metrics of the shared client in Prometheus text format."""
+        body=get_github_client().metrics.render_prometheus()
+        return PlainTextResponse(body,media_type="text/plain; version=0.0.4")
+
+    async def handle(self,request:Request)->JSONResponse:
+        body=await request.body()
+        self.stats["received"]+=1
+
+        if self.secret and not verify_signature(self.secret,body,request.headers.get("X-Hub-Signature-256")):
+            self.stats["rejected"]+=1
+            return JSONResponse({"error":"invalid signature"},status_code=401)
+
+        delivery=request.headers.get("X-GitHub-Delivery")
+        if delivery and not self._remember(self._deliveries,delivery):
+            return JSONResponse({"status":"duplicate delivery"})
+
+        event=request.headers.get("X-GitHub-Event","")
+        if event=="ping":
+            return JSONResponse({"status":"pong"})
+
+        try:
+            payload=json.loads(body)
+        except ValueError:
+            self.stats["rejected"]+=1
+            return JSONResponse({"error":"invalid JSON"},status_code=400)
+
+        failure=failure_from_event(event,payload)
+        if failure is not None and event=="workflow_job":
+            self.stats["hints"]+=1
+            logger.info(
+                f"Job failed in run {failure['id']} attempt {failure['run_attempt']} "
+                f"({failure['owner']}/{failure['repo']}), analysis starts when the run completes"
+            )
+            return JSONResponse({"status":"noted"})
+
+        if failure is None or not self._remember(self._queued_runs,(failure["id"],failure["run_attempt"])):
+            self.stats["ignored"]+=1
+            return JSONResponse({"status":"ignored"})
+
+        try:
+            self.queue.put_nowait(failure)
+        except asyncio.QueueFull:
+            self._queued_runs.pop((failure["id"],failure["run_attempt"]),None)
+            self.stats["dropped"]+=1
+            logger.warning(f"Webhook queue full, dropping run {failure['id']}")
+            return JSONResponse({"error":"queue full"},status_code=503)
+
+        self.stats["queued"]+=1
+        logger.info(f"Queued failed run {failure['id']} from {event} webhook ({failure['owner']}/{failure['repo']})")
+        return JSONResponse({"status":"queued"},status_code=202)
+
+    async def next_batch(self,max_size:int=10,window:float=1.0,timeout:Optional[float]=None)->List[Dict[str,Any]]:
+        """
+        Wait up to timeout seconds for one failure, then collect whatever else
+        arrives within window seconds. Returns an empty list on timeout.
+        """
+        try:
+            batch=[await asyncio.wait_for(self.queue.get(),timeout)]
+        except asyncio.TimeoutError:
+            return []
+
+        loop=asyncio.get_running_loop()
+        deadline=loop.time()+window
+        while len(batch)<max_size:
+            remaining=deadline-loop.time()
+            if remaining<=0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(),remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def create_server(self,host:str=DEFAULT_WEBHOOK_HOST,port:int=8080)->uvicorn.Server:
+        config=uvicorn.Config(self.app,host=host,port=port,log_level="warning")
+        return uvicorn.Server(config)
+
+async def _analyze_batch(state:AgentState,batch:List[Dict[str,Any]])->AgentState:
+    processed_runs=state.context.setdefault("processed_runs",set())
+
+    by_repo:Dict[Tuple[str,str],List[Dict[str,Any]]]={}
+    for failure in batch:
+        # a re-run is a new attempt of the same run id and gets its own analysis
+        attempt=(failure["id"],failure["run_attempt"])
+        if attempt in processed_runs:
+            continue
+        processed_runs.add(attempt)
+        by_repo.setdefault((failure["owner"],failure["repo"]),[]).append(failure)
+
+    for (owner,repo),failures in by_repo.items():
+        state.context["owner"]=owner
+        state.context["repo"]=repo
+        state.context["detected_failures"]=failures
+        state.memory.append(f"[{datetime.now().isoformat()}] Webhook: {len(failures)} failed runs in {owner}/{repo}")
+        state=await failure_analysis_node(state)
+    return state
+
+async def serve_webhooks(
+    initial_state:AgentState,
+    receiver:Optional[WebhookReceiver]=None,
+    host:str=DEFAULT_WEBHOOK_HOST,
+    port:int=8080,
+    reconcile:bool=True
+)->None:
+    """
+    Run the agent in webhook mode.
+
+    Failures pushed by GitHub go straight to the analysis stage. Polling via
+    github_monitor_node still runs every monitoring_interval seconds as a
+    reconciliation pass for deliveries that were missed or dropped.
+    """
+    receiver=receiver or WebhookReceiver()
+    state=start_node(initial_state)
+    if state.status=="error":
+        return
+
+    server=receiver.create_server(host,port)
+    server_task=asyncio.create_task(server.serve())
+    logger.info(f"Listening for GitHub webhooks on {host}:{port}")
+
+    interval=state.context.get("monitoring_interval",300)
+    loop=asyncio.get_running_loop()
+    next_reconcile=loop.time()+interval
+
+    try:
+        while not server_task.done():
+            timeout=max(next_reconcile-loop.time(),0) if reconcile else 1.0
+            batch=await receiver.next_batch(timeout=timeout)
+            if batch:
+                state=await _analyze_batch(state,batch)
+
+            if reconcile and loop.time()>=next_reconcile:
+                logger.info("Running polling reconciliation")
+                owner,repo=initial_state.context["owner"],initial_state.context["repo"]
+                state.context.update({"owner":owner,"repo":repo,"detected_failures":[]})
+                state=await github_monitor_node(state)
+                if state.context.get("detected_failures"):
+                    state=await failure_analysis_node(state)
+                next_reconcile=loop.time()+interval
+    finally:
+        server.should_exit=True
+        await server_task
+
+if __name__=="__main__":
+    owner=os.getenv("OWNER")
+    repo=os.getenv("REPO")
+    if not owner or not repo:
+        print("Set OWNER and REPO for the polling reconciliation")
+    else:
+        asyncio.run(serve_webhooks(
+            AgentState(
+                id="agent-gh-webhook-001",
+                name="GitHub Webhook Listener",
+                role="monitor_and_debug",
+                status="created",
+                memory=[],
+                goals=["Analyze workflow failures as soon as GitHub reports them"],
+                current_task=None,
+                sub_tasks=[],
+                context={"owner":owner,"repo":repo},
+                last_updated=datetime.now().isoformat()
+            ),
+            host=os.getenv("WEBHOOK_HOST",DEFAULT_WEBHOOK_HOST),
+            port=int(os.getenv("WEBHOOK_PORT","8080"))
+        ))
+
+#python -m src.agents.webhook_server
@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import base64
+import io
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from remote_zip import RemoteZipReader
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler that honours single byte ranges, like blob storage does."""
+
+    bytes_sent = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        size = os.path.getsize(path)
+        start, end = 0, size - 1
+        header = self.headers.get("Range")
+        if header and header.startswith("bytes="):
+            first, _, last = header[len("bytes="):].partition("-")
+            if first == "":
+                start = max(size - int(last), 0)
+            else:
+                start = int(first)
+                end = min(int(last), size - 1) if last else size - 1
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+
+        length = end - start + 1
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = length
+            while remaining:
+                chunk = f.read(min(remaining, 1 << 16))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+        with self.lock:
+            RangeRequestHandler.bytes_sent += length
+
+
+def build_archive(path: str, jobs: int, steps: int, step_kb: int, target_kb: int) -> str:
+    """Synthetic run log archive: one file per job plus one per step, like GitHub's."""
+    target = None
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for job in range(jobs):
+            job_name = f"test (matrix-{job})"
+            job_log = io.StringIO()
+            for step in range(1, steps + 1):
+                size = target_kb if (job, step) == (jobs // 2, steps) else step_kb
+                # random payload so the archive does not deflate down to nothing
+                body = base64.b64encode(os.urandom(size * 768)).decode()
+                text = "\n".join(body[i:i + 120] for i in range(0, len(body), 120))
+                member = f"{job_name}/{step}_Step {step}.txt"
+                archive.writestr(member, text)
+                job_log.write(text)
+                if (job, step) == (jobs // 2, steps):
+                    target = member
+            archive.writestr(f"{job}_{job_name}.txt", job_log.getvalue())
+    return target
+
+
+async def full_download(client: httpx.AsyncClient, url: str, member: str) -> int:
+    """Returns the number of HTTP requests made."""
+    fd, path = tempfile.mkstemp(suffix=".zip")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async with client.stream("GET", url) as response:
+                async for chunk in response.aiter_bytes(1 << 16):
+                    f.write(chunk)
+        with zipfile.ZipFile(path) as archive:
+            archive.read(member)
+        return 1
+    finally:
+        os.remove(path)
+
+
+async def ranged_read(client: httpx.AsyncClient, url: str, member: str) -> int:
+    reader = await RemoteZipReader(client, url).open()
+    await reader.read(member)
+    return reader.requests
+
+
+async def run_benchmark(args) -> None:
+    workdir = tempfile.mkdtemp(prefix="bench-remote-zip-")
+    archive_path = os.path.join(workdir, "logs.zip")
+    member = build_archive(archive_path, args.jobs, args.steps, args.step_kb, args.target_kb)
+    archive_size = os.path.getsize(archive_path)
+
+    handler = lambda *a, **kw: RangeRequestHandler(*a, directory=workdir, **kw)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/logs.zip"
+
+    print(f"Archive: {archive_size / 1e6:.1f} MB, {args.jobs} jobs x {args.steps} steps")
+    print(f"Target member: {member}\n")
+    print(f"{'method':<16}{'bytes':>14}{'requests':>10}{'latency ms':>14}")
+
+    async with httpx.AsyncClient(timeout=120.0) as client:
+        for name, method in (("full download", full_download), ("range read", ranged_read)):
+            timings = []
+            RangeRequestHandler.bytes_sent = 0
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                requests = await method(client, url, member)
+                timings.append((time.perf_counter() - start) * 1000)
+            transferred = RangeRequestHandler.bytes_sent // args.repeat
+            print(f"{name:<16}{transferred:>14,}{requests:>10}{min(timings):>14.1f}")
+
+    server.shutdown()
+    os.remove(archive_path)
+    os.rmdir(workdir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Full log archive download vs. byte-range member read")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--step-kb", type=int, default=400, help="size of each step log")
+    parser.add_argument("--target-kb", type=int, default=40, help="size of the failed step log to read")
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(run_benchmark(parser.parse_args()))
@@ -0,0 +1,88 @@
+import argparse
+import json
+import time
+
+from github_mcp import RunRecord, WorkflowRunsResponse, _json_loads
+
+
+def make_run(i: int) -> dict:
+    """A workflow run shaped like the real API payload, nested objects included."""
+    sha = f"{i:040x}"
+    user = {
+        "login": "octocat", "id": 1, "node_id": "MDQ6VXNlcjE=", "type": "User", "site_admin": False,
+        "avatar_url": "https://avatars.githubusercontent.com/u/1?v=4",
+        "url": "https://api.github.com/users/octocat", "html_url": "https://github.com/octocat"
+    }
+    repository = {
+        "id": 1296269, "node_id": "MDEwOlJlcG9zaXRvcnkxMjk2MjY5", "name": "Hello-World",
+        "full_name": "octocat/Hello-World", "private": False, "owner": user,
+        "html_url": "https://github.com/octocat/Hello-World", "description": "This your first repo!",
+        "fork": False, "url": "https://api.github.com/repos/octocat/Hello-World"
+    }
+    return {
+        "id": 30433642 + i, "name": "CI Tests", "node_id": "MDEyOldvcmtmbG93IFJ1bjI2OTI4OQ==",
+        "check_suite_id": 42 + i, "check_suite_node_id": "MDEwOkNoZWNrU3VpdGU0Mg==",
+        "head_branch": "main", "head_sha": sha, "path": ".github/workflows/ci.yml",
+        "run_number": 562 - i, "run_attempt": 1, "event": "push", "display_title": "Fix flaky test",
+        "status": "completed", "conclusion": "failure", "workflow_id": 159038,
+        "url": f"https://api.github.com/repos/octocat/Hello-World/actions/runs/{30433642 + i}",
+        "html_url": f"https://github.com/octocat/Hello-World/actions/runs/{30433642 + i}",
+        "pull_requests": [], "created_at": "2026-10-17T09:12:03Z", "updated_at": "2026-10-17T09:15:41Z",
+        "run_started_at": "2026-10-17T09:12:03Z", "actor": user, "triggering_actor": user,
+        "jobs_url": f"https://api.github.com/repos/octocat/Hello-World/actions/runs/{30433642 + i}/jobs",
+        "logs_url": f"https://api.github.com/repos/octocat/Hello-World/actions/runs/{30433642 + i}/logs",
+        "head_commit": {
+            "id": sha, "tree_id": sha, "message": "Fix flaky test\n\nRetry the request on timeout",
+            "timestamp": "2026-10-17T09:11:58Z",
+            "author": {"name": "Octo Cat", "email": "octocat@github.com"},
+            "committer": {"name": "GitHub", "email": "noreply@github.com"}
+        },
+        "repository": repository, "head_repository": repository
+    }
+
+
+def current_path(body: bytes) -> list:
+    """response.json() -> pydantic validation -> dict copy per run, as github_monitor_node used to do."""
+    response = WorkflowRunsResponse(**json.loads(body))
+    return [
+        {
+            "id": run.id, "run_number": run.run_number, "name": run.name, "status": run.status,
+            "conclusion": run.conclusion, "head_branch": run.head_branch, "head_sha": run.head_sha,
+            "created_at": run.created_at, "updated_at": run.updated_at, "url": run.url
+        }
+        for run in response.workflow_runs
+    ]
+
+
+def fast_path(body: bytes) -> list:
+    data = _json_loads(body)
+    from_api = RunRecord.from_api
+    return [from_api(run) for run in data["workflow_runs"]]
+
+
+def bench(fn, body: bytes, iterations: int) -> float:
+    fn(body)
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn(body)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Workflow run page parsing: pydantic path vs. fast path")
+    parser.add_argument("--runs", type=int, default=100, help="runs per page")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    body = json.dumps({"total_count": 5000, "workflow_runs": [make_run(i) for i in range(args.runs)]}).encode()
+    print(f"Page: {args.runs} runs, {len(body) / 1024:.0f} KiB ({_json_loads.__module__} decoder)\n")
+
+    current = bench(current_path, body, args.iterations)
+    fast = bench(fast_path, body, args.iterations)
+    print(f"{'path':<28}{'us/page':>12}{'us/run':>10}")
+    print(f"{'json + pydantic + dict copy':<28}{current:>12.1f}{current / args.runs:>10.2f}")
+    print(f"{'orjson + RunRecord':<28}{fast:>12.1f}{fast / args.runs:>10.2f}")
+    print(f"\nSpeedup: {current / fast:.1f}x")
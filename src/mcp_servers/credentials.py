@@ -0,0 +1,121 @@
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+try:
+    from .rate_limiter import RateLimitScheduler
+except ImportError:
+    from rate_limiter import RateLimitScheduler
+
+logger = logging.getLogger("CredentialPool")
+
+TokenProvider = Callable[[], Awaitable[Tuple[str, Optional[float]]]]
+
+
+class Credential:
+    """
+    A GitHub token (personal or App installation) with its own rate-limit budget.
+
+    owners restricts which accounts the credential is routed to; None means it
+    can be used for any owner. Installation tokens expire after an hour, so they
+    can be supplied through an async token_provider returning (token, expires_at).
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        owners: Optional[Iterable[str]] = None,
+        name: Optional[str] = None,
+        token_provider: Optional[TokenProvider] = None,
+        max_wait: float = 900.0
+    ):
+        if not token and token_provider is None:
+            raise ValueError("Credential needs a token or a token_provider")
+
+        self.token = token
+        self.owners = {owner.lower() for owner in owners} if owners else None
+        self.name = name or (f"token-...{token[-4:]}" if token else "installation")
+        self.token_provider = token_provider
+        self.expires_at: Optional[float] = None
+        self.scheduler = RateLimitScheduler(max_wait=max_wait)
+
+    @property
+    def authorization(self) -> str:
+        return f"token {self.token}"
+
+    def can_access(self, owner: Optional[str]) -> bool:
+        return self.owners is None or owner is None or owner.lower() in self.owners
+
+    def budget(self) -> float:
+        status = self.scheduler.status()
+        if status["blocked_for"] > 0:
+            return -1.0
+        return status["remaining"] + status["tokens"] / max(self.scheduler.burst, 1)
+
+    async def refresh_if_needed(self) -> None:
+        if self.token_provider is None:
+            return
+        if self.token and (self.expires_at is None or time.time() < self.expires_at - 60):
+            return
+
+        self.token, self.expires_at = await self.token_provider()
+        logger.info(f"Refreshed installation token for {self.name}")
+
+
+class CredentialPool:
+    """Routes each request to the accessible credential with the most remaining budget."""
+
+    def __init__(self, credentials: List[Credential]):
+        if not credentials:
+            raise ValueError("Provide proper GITHUB_TOKEN")
+        self.credentials = credentials
+
+    @classmethod
+    def from_env(cls, token: Optional[str] = None, max_wait: float = 900.0) -> "CredentialPool":
+        """
+        Build the pool from an explicit token, GITHUB_TOKEN and GITHUB_TOKENS.
+
+        GITHUB_TOKENS is a comma separated list; an entry may be restricted to
+        specific owners with the form "owner1|owner2:token".
+        """
+        credentials = []
+        seen = set()
+
+        def add(token: str, owners: Optional[List[str]] = None) -> None:
+            if token and token not in seen:
+                seen.add(token)
+                credentials.append(Credential(token=token, owners=owners, max_wait=max_wait))
+
+        add(token or os.getenv("GITHUB_TOKEN"))
+        for entry in os.getenv("GITHUB_TOKENS", "").split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            if ":" in entry:
+                owners, entry_token = entry.split(":", 1)
+                add(entry_token.strip(), [o.strip() for o in owners.split("|") if o.strip()])
+            else:
+                add(entry)
+
+        return cls(credentials)
+
+    @property
+    def primary(self) -> Credential:
+        return self.credentials[0]
+
+    def select(self, owner: Optional[str] = None) -> Credential:
+        candidates = [c for c in self.credentials if c.can_access(owner)]
+        if not candidates:
+            raise ValueError(f"No GitHub credential has access to {owner}")
+        return max(candidates, key=lambda c: c.budget())
+
+    def status(self) -> List[dict]:
+        return [
+            {
+                "name": c.name,
+                "owners": sorted(c.owners) if c.owners else None,
+                **c.scheduler.status()
+            }
+            for c in self.credentials
+        ]
@@ -0,0 +1,322 @@
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import random
+import time
+import zipfile
+from collections import OrderedDict
+from typing import Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, RedirectResponse, Response
+from starlette.routing import Route
+
+try:
+    from .workload import Workload, public
+except ImportError:
+    from workload import Workload, public
+
+logger = logging.getLogger("FakeGitHub")
+
+MAX_CACHED_ARCHIVES = 64
+
+
+class FakeGitHub:
+    """
+    Local stand-in for the GitHub Actions REST API, backed by a Workload.
+
+    Covers repos/org listing, runs (branch, status, created and paging
+    filters), jobs, run and job log redirects to a blob host that honours
+    Range requests, re-runs and /rate_limit. Responses carry ETags (If-None-Match
+    gets a 304 that is not billed) and X-RateLimit-* headers from a simulated
+    hourly budget. latency/jitter (seconds) delay every API response and
+    error_rate answers that share of API requests with a 502/503.
+
+    Point GitHubMCP at it with base_url=server.url or GITHUB_API_URL.
+    """
+
+    def __init__(
+        self,
+        workload: Workload,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: int = 5000,
+        seed: int = 0
+    ):
+        self.workload = workload
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self._rng = random.Random(seed)
+        self._archives: "OrderedDict[int, bytes]" = OrderedDict()
+
+        self.stats = {"requests": 0, "not_modified": 0, "errors_injected": 0, "rate_limited": 0, "blob_bytes": 0}
+
+        api = [
+            Route("/rate_limit", self.get_rate_limit),
+            Route("/orgs/{owner}/repos", self.list_repos),
+            Route("/users/{owner}/repos", self.list_repos),
+            Route("/orgs/{owner}/actions/permissions", self.actions_permissions),
+            Route("/repos/{owner}/{repo}", self.get_repo),
+            Route("/repos/{owner}/{repo}/actions/runs", self.list_runs),
+            Route("/repos/{owner}/{repo}/actions/workflows/{workflow_id}/runs", self.list_runs),
+            Route("/repos/{owner}/{repo}/actions/runs/{run_id:int}", self.get_run),
+            Route("/repos/{owner}/{repo}/actions/runs/{run_id:int}/jobs", self.list_jobs),
+            Route("/repos/{owner}/{repo}/actions/runs/{run_id:int}/logs", self.run_logs),
+            Route("/repos/{owner}/{repo}/actions/jobs/{job_id:int}/logs", self.job_logs),
+            Route("/repos/{owner}/{repo}/actions/runs/{run_id:int}/rerun", self.rerun, methods=["POST"]),
+            Route("/repos/{owner}/{repo}/actions/runs/{run_id:int}/rerun-failed-jobs", self.rerun, methods=["POST"]),
+        ]
+        blobs = [
+            Route("/_blobs/runs/{run_id:int}.zip", self.run_archive),
+            Route("/_blobs/jobs/{job_id:int}.txt", self.job_log_blob),
+        ]
+        self.app = Starlette(routes=[Route(r.path, self._api(r.endpoint), methods=r.methods) for r in api] + blobs)
+
+    # -- API plumbing -----------------------------------------------------
+
+    def _rate_headers(self) -> dict:
+        now = time.time()
+        if now >= self.reset_at:
+            self.remaining = self.rate_limit
+            self.reset_at = int(now) + 3600
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Used": str(self.rate_limit - self.remaining),
+            "X-RateLimit-Reset": str(self.reset_at),
+            "X-RateLimit-Resource": "core"
+        }
+
+    def _api(self, endpoint):
+        async def handle(request: Request) -> Response:
+            self.stats["requests"] += 1
+            if self.latency or self.jitter:
+                await asyncio.sleep(max(self.latency + self._rng.uniform(-self.jitter, self.jitter), 0))
+
+            if not request.headers.get("Authorization"):
+                return JSONResponse({"message": "Requires authentication"}, status_code=401)
+
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.stats["errors_injected"] += 1
+                return JSONResponse({"message": "Server Error"}, status_code=self._rng.choice((502, 503)))
+
+            headers = self._rate_headers()
+            if self.remaining <= 0 and request.url.path != "/rate_limit":
+                self.stats["rate_limited"] += 1
+                return JSONResponse({"message": "API rate limit exceeded"}, status_code=403, headers=headers)
+
+            response = await endpoint(request)
+            if isinstance(response, (dict, list)):
+                body = json.dumps(response).encode()
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if request.headers.get("If-None-Match") == etag:
+                    self.stats["not_modified"] += 1
+                    return Response(status_code=304, headers={**headers, "ETag": etag})
+                response = Response(body, media_type="application/json", headers={"ETag": etag})
+
+            if request.url.path != "/rate_limit":
+                self.remaining -= 1
+                headers = self._rate_headers()
+            response.headers.update(headers)
+            return response
+        return handle
+
+    def _repo_runs(self, request: Request) -> Optional[list]:
+        return self.workload.runs.get(f"{request.path_params['owner']}/{request.path_params['repo']}")
+
+    @staticmethod
+    def _page(request: Request, items: list, default: int = 30) -> list:
+        per_page = min(int(request.query_params.get("per_page", default)), 100)
+        page = int(request.query_params.get("page", 1))
+        return items[(page - 1) * per_page:page * per_page]
+
+    @staticmethod
+    def _not_found() -> JSONResponse:
+        return JSONResponse({"message": "Not Found"}, status_code=404)
+
+    # -- endpoints --------------------------------------------------------
+
+    async def get_rate_limit(self, request: Request):
+        core = {"limit": self.rate_limit, "remaining": self.remaining, "used": self.rate_limit - self.remaining, "reset": self.reset_at}
+        return {"resources": {"core": core}, "rate": core}
+
+    async def list_repos(self, request: Request):
+        if request.path_params["owner"] != self.workload.owner:
+            return self._not_found()
+        repos = sorted(self.workload.repos, key=lambda repo: repo["pushed_at"], reverse=True)
+        return self._page(request, repos)
+
+    async def actions_permissions(self, request: Request):
+        return {"enabled_repositories": "all", "allowed_actions": "all"}
+
+    async def get_repo(self, request: Request):
+        full_name = f"{request.path_params['owner']}/{request.path_params['repo']}"
+        for repo in self.workload.repos:
+            if repo["full_name"] == full_name:
+                return repo
+        return self._not_found()
+
+    async def list_runs(self, request: Request):
+        runs = self._repo_runs(request)
+        if runs is None:
+            return self._not_found()
+
+        query = request.query_params
+        branch = query.get("branch")
+        status = query.get("status")
+        created = query.get("created", "")
+        if branch:
+            runs = [run for run in runs if run["head_branch"] == branch]
+        if status in ("success", "failure", "cancelled", "skipped"):
+            runs = [run for run in runs if run["conclusion"] == status]
+        elif status:
+            runs = [run for run in runs if run["status"] == status]
+        if created.startswith(">="):
+            runs = [run for run in runs if run["created_at"] >= created[2:]]
+        elif created.startswith("<="):
+            runs = [run for run in runs if run["created_at"] <= created[2:]]
+        elif ".." in created:
+            low, _, high = created.partition("..")
+            runs = [run for run in runs if low <= run["created_at"] <= high]
+
+        return {"total_count": len(runs), "workflow_runs": [public(run) for run in self._page(request, runs)]}
+
+    async def get_run(self, request: Request):
+        run = self.workload.runs_by_id.get(request.path_params["run_id"])
+        if run is None:
+            return self._not_found()
+        base = f"{request.base_url}repos/{run['_repo']}/actions/runs/{run['id']}"
+        return {**public(run), "jobs_url": f"{base}/jobs", "logs_url": f"{base}/logs"}
+
+    async def list_jobs(self, request: Request):
+        run = self.workload.runs_by_id.get(request.path_params["run_id"])
+        if run is None:
+            return self._not_found()
+        jobs = [public(self.workload.jobs_by_id[job_id]) for job_id in run["_job_ids"]]
+        return {"total_count": len(jobs), "jobs": self._page(request, jobs)}
+
+    async def run_logs(self, request: Request):
+        if request.path_params["run_id"] not in self.workload.runs_by_id:
+            return self._not_found()
+        return RedirectResponse(f"{request.base_url}_blobs/runs/{request.path_params['run_id']}.zip", status_code=302)
+
+    async def job_logs(self, request: Request):
+        if request.path_params["job_id"] not in self.workload.jobs_by_id:
+            return self._not_found()
+        return RedirectResponse(f"{request.base_url}_blobs/jobs/{request.path_params['job_id']}.txt", status_code=302)
+
+    async def rerun(self, request: Request):
+        if request.path_params["run_id"] not in self.workload.runs_by_id:
+            return self._not_found()
+        failed_jobs_only = request.url.path.endswith("rerun-failed-jobs")
+        self.workload.rerun(request.path_params["run_id"], failed_jobs_only)
+        return Response(status_code=201)
+
+    # -- blob host (no auth, no rate limit, like the signed storage URLs) --
+
+    def _build_archive(self, run_id: int) -> bytes:
+        archive = self._archives.get(run_id)
+        if archive is not None:
+            self._archives.move_to_end(run_id)
+            return archive
+
+        run = self.workload.runs_by_id[run_id]
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            for index, job_id in enumerate(run["_job_ids"]):
+                job = self.workload.jobs_by_id[job_id]
+                zf.writestr(f"{index}_{job['name']}.txt", self.workload.job_log(job))
+                for step in job["steps"]:
+                    zf.writestr(f"{job['name']}/{step['number']}_{step['name']}.txt", self.workload.step_log(job, step))
+        archive = buffer.getvalue()
+
+        self._archives[run_id] = archive
+        if len(self._archives) > MAX_CACHED_ARCHIVES:
+            self._archives.popitem(last=False)
+        return archive
+
+    def _ranged(self, request: Request, body: bytes, media_type: str) -> Response:
+        size = len(body)
+        header = request.headers.get("Range", "")
+        if not header.startswith("bytes="):
+            self.stats["blob_bytes"] += size
+            return Response(body, media_type=media_type, headers={"Accept-Ranges": "bytes"})
+
+        first, _, last = header[len("bytes="):].partition("-")
+        if first == "":
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start, end = int(first), min(int(last), size - 1) if last else size - 1
+        chunk = body[start:end + 1]
+        self.stats["blob_bytes"] += len(chunk)
+        return Response(chunk, status_code=206, media_type=media_type, headers={
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{size}"
+        })
+
+    async def run_archive(self, request: Request) -> Response:
+        run_id = request.path_params["run_id"]
+        if run_id not in self.workload.runs_by_id:
+            return self._not_found()
+        return self._ranged(request, self._build_archive(run_id), "application/zip")
+
+    async def job_log_blob(self, request: Request) -> Response:
+        job = self.workload.jobs_by_id.get(request.path_params["job_id"])
+        if job is None:
+            return self._not_found()
+        return self._ranged(request, self.workload.job_log(job).encode(), "text/plain")
+
+    # -- serving ----------------------------------------------------------
+
+    def create_server(self, host: str = "127.0.0.1", port: int = 0) -> uvicorn.Server:
+        config = uvicorn.Config(self.app, host=host, port=port, log_level="warning")
+        return uvicorn.Server(config)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve in the background on the running loop; returns the base URL."""
+        self._server = self.create_server(host, port)
+        self._task = asyncio.create_task(self._server.serve())
+        while not self._server.started:
+            if self._task.done():
+                self._task.result()
+            await asyncio.sleep(0.01)
+        port = self._server.servers[0].sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        self._server.should_exit = True
+        await self._task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fake GitHub Actions API")
+    parser.add_argument("--owner", default="acme")
+    parser.add_argument("--repos", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=200, help="runs per repo")
+    parser.add_argument("--failure-rate", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every API response")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    fake = FakeGitHub(
+        Workload(owner=args.owner, repos=args.repos, runs_per_repo=args.runs, failure_rate=args.failure_rate),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate
+    )
+    print(f"Serving {fake.workload.total_runs} runs ({fake.workload.failed_runs} failed) for {args.owner} on port {args.port}")
+    print(f"export GITHUB_API_URL=http://127.0.0.1:{args.port} GITHUB_TOKEN=fake")
+    fake.create_server(port=args.port).run()
@@ -1,17 +1,83 @@
 from mcp.server.fastmcp import FastMCP
 import httpx
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, TextIO, Tuple, Union
 import logging
+import asyncio
+import json
+import hashlib
+import io
+import math
+import tempfile
+import time
+import zipfile
 from dotenv import load_dotenv
 import os
 from datetime import datetime
 load_dotenv()
 
+try:
+    from .response_cache import ResponseCache
+except ImportError:
+    from response_cache import ResponseCache
+
+try:
+    from .rate_limiter import RateLimitError, INTERACTIVE, BACKGROUND
+except ImportError:
+    from rate_limiter import RateLimitError, INTERACTIVE, BACKGROUND
+
+try:
+    from .credentials import Credential, CredentialPool
+except ImportError:
+    from credentials import Credential, CredentialPool
+
+try:
+    from .remote_zip import RemoteZipReader, RangeNotSupportedError
+except ImportError:
+    from remote_zip import RemoteZipReader, RangeNotSupportedError
+
+try:
+    from .resilience import CircuitBreaker, retry_policy
+except ImportError:
+    from resilience import CircuitBreaker, retry_policy
+
+try:
+    from .metrics import MetricsRegistry, endpoint_template
+except ImportError:
+    from metrics import MetricsRegistry, endpoint_template
+
+try:
+    from .single_flight import SingleFlight
+except ImportError:
+    from single_flight import SingleFlight
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("GitHubMCP")
 
+MAX_FILTERED_RUNS = 1000
+MAX_THROTTLED_ATTEMPTS = 3
+LOG_CHUNK_SIZE = 64 * 1024
+
+
+def _count_retry(retry_state) -> None:
+    """tenacity before_sleep hook: count retries on the GitHubMCP instance's registry."""
+    github = retry_state.args[0]
+    exc = retry_state.outcome.exception()
+    reason = exc.response.status_code if isinstance(exc, httpx.HTTPStatusError) else type(exc).__name__
+    github.m_retries.inc(operation=retry_state.fn.__name__, reason=reason)
+
 
 class RepoInfo(BaseModel):
     name: str
@@ -31,9 +97,32 @@ class RepoInfo(BaseModel):
         populate_by_name = True
 
 
+class RepoSummary(BaseModel):
+    name: str
+    full_name: str
+    owner: str
+    default_branch: str
+    archived: bool = False
+    disabled: bool = False
+    pushed_at: Optional[str] = None
+
+    @classmethod
+    def from_api(cls, data: dict) -> "RepoSummary":
+        return cls(
+            name=data["name"],
+            full_name=data["full_name"],
+            owner=data["owner"]["login"],
+            default_branch=data.get("default_branch") or "main",
+            archived=data.get("archived", False),
+            disabled=data.get("disabled", False),
+            pushed_at=data.get("pushed_at")
+        )
+
+
 class WorkflowRun(BaseModel):
     id: int
     run_number: int
+    run_attempt: int = 1
     name: str
     head_branch: str
     head_sha: str
@@ -52,6 +141,38 @@ class WorkflowRunsResponse(BaseModel):
     workflow_runs: List[WorkflowRun]
 
 
+class RunRecord:
+    """
+    Compact, trusted view of a workflow run used on the bulk polling path.
+
+    Built straight from the decoded API payload without pydantic validation;
+    attribute names match WorkflowRun.
+    """
+    __slots__ = (
+        "id", "run_number", "run_attempt", "name", "head_branch", "head_sha",
+        "status", "conclusion", "created_at", "updated_at", "url"
+    )
+
+    @classmethod
+    def from_api(cls, data: dict) -> "RunRecord":
+        record = cls.__new__(cls)
+        record.id = data["id"]
+        record.run_number = data["run_number"]
+        record.run_attempt = data.get("run_attempt", 1)
+        record.name = data["name"]
+        record.head_branch = data["head_branch"]
+        record.head_sha = data["head_sha"]
+        record.status = data["status"]
+        record.conclusion = data.get("conclusion")
+        record.created_at = data["created_at"]
+        record.updated_at = data["updated_at"]
+        record.url = data["html_url"]
+        return record
+
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
 class FailedRunsResponse(BaseModel):
     total_count: int
     failed_runs: List[WorkflowRun] 
@@ -76,6 +197,34 @@ class RunStatus(BaseModel):
         populate_by_name = True
 
 
+class WorkflowStep(BaseModel):
+    name: str
+    number: int
+    status: str
+    conclusion: Optional[str] = None
+
+
+class WorkflowJob(BaseModel):
+    id: int
+    run_id: int
+    run_attempt: Optional[int] = None
+    name: str
+    status: str
+    conclusion: Optional[str] = None
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    steps: List[WorkflowStep] = []
+    url: Optional[str] = Field(default=None, alias="html_url")
+
+    class Config:
+        populate_by_name = True
+
+
+class JobsResponse(BaseModel):
+    total_count: int
+    jobs: List[WorkflowJob]
+
+
 class LogsResponse(BaseModel):
     download_url: Optional[str] = None
     message: str
@@ -97,136 +246,564 @@ class RateLimitStatus(BaseModel):
     reset_in_seconds: float
 
 
-class RateLimitError(Exception):
-    """Raised when GitHub API rate limit is exceeded"""
-    pass
-
-
 class GitHubMCP:
     
-    def __init__(self, token: Optional[str] = None):
-        self.token = token or os.getenv("GITHUB_TOKEN")
-        if not self.token:
-            raise ValueError("Provide proper GITHUB_TOKEN")
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        http2: Optional[bool] = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        cache: Optional[ResponseCache] = None,
+        enable_cache: bool = True,
+        credentials: Optional[CredentialPool] = None,
+        single_flight_ttl: Optional[float] = None,
+        base_url: Optional[str] = None,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        max_wait = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "900"))
+        self.credentials = credentials or CredentialPool.from_env(token, max_wait=max_wait)
+        self.token = self.credentials.primary.token
         
-        self.base_url = "https://api.github.com"
+        # GITHUB_API_URL also points the client at GitHub Enterprise or the local fake_github server
+        self.base_url = (base_url or os.getenv("GITHUB_API_URL", "https://api.github.com")).rstrip("/")
         self.headers = {
-            "Authorization": f"token {self.token}",
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "GitHub-MCP-Server/1.0"
         }
+
+        if http2 is None:
+            http2 = os.getenv("GITHUB_HTTP2", "false").lower() in ("1", "true", "yes")
+        if http2 and not _HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        # fail fast on an unreachable host instead of waiting out the full timeout
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, 10.0))
+        self._client: Optional[httpx.AsyncClient] = None
+
+        if cache is None and enable_cache:
+            cache = ResponseCache(
+                max_entries=int(os.getenv("GITHUB_CACHE_SIZE", "256")),
+                path=os.getenv("GITHUB_CACHE_PATH")
+            )
+        self.cache = cache
+
+        if single_flight_ttl is None:
+            single_flight_ttl = float(os.getenv("GITHUB_SINGLE_FLIGHT_TTL", "0"))
+        self.single_flight = SingleFlight(ttl=single_flight_ttl)
+
+        self.breaker_threshold = int(os.getenv("GITHUB_BREAKER_THRESHOLD", "5"))
+        self.breaker_reset_timeout = float(os.getenv("GITHUB_BREAKER_RESET_TIMEOUT", "30"))
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+        self.metrics = metrics or MetricsRegistry()
+        self.m_requests = self.metrics.counter("github_api_requests_total", "GitHub API requests by method, endpoint and status")
+        self.m_latency = self.metrics.histogram("github_api_request_duration_seconds", "GitHub API request latency")
+        self.m_bytes = self.metrics.counter("github_api_response_bytes_total", "GitHub API response body bytes")
+        self.m_retries = self.metrics.counter("github_api_retries_total", "Retried GitHub API calls by operation and reason")
+        self.m_throttled = self.metrics.counter("github_api_throttled_total", "Requests rejected by a GitHub rate limit and retried after backing off")
+        self.m_log_bytes = self.metrics.counter("github_log_download_bytes_total", "Log bytes streamed from the log storage host")
+        self.metrics.add_collector(self._collect_metrics)
         logger.info("GitHubMCP initialized successfully")
 
-    def _check_rate_limit(self, response: httpx.Response) -> None:
-        remaining = int(response.headers.get("X-RateLimit-Remaining", 1))
-        if remaining == 0:
-            reset_timestamp = int(response.headers.get("X-RateLimit-Reset", 0))
-            reset_time = datetime.fromtimestamp(reset_timestamp)
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Long-lived pooled client, created lazily on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self.cache is not None:
+            self.cache.save()
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("GitHubMCP client closed")
+        self._client = None
+
+    async def __aenter__(self) -> "GitHubMCP":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    @staticmethod
+    def _owner_from_endpoint(endpoint: str) -> Optional[str]:
+        parts = endpoint.lstrip("/").split("/")
+        if len(parts) >= 2 and parts[0] in ("repos", "orgs", "users"):
+            return parts[1]
+        return None
+
+    def _check_rate_limit(self, response: httpx.Response, credential: Credential) -> float:
+        """Feed the credential's scheduler; returns the back-off delay if GitHub throttled the request."""
+        scheduler = credential.scheduler
+        delay = scheduler.update(response)
+        if delay > scheduler.max_wait:
+            reset_time = datetime.fromtimestamp(scheduler.blocked_until)
             raise RateLimitError(
-                f"GitHub API rate limit exceeded. Resets at {reset_time}"
+                f"GitHub API rate limit exceeded for {credential.name}. Resets at {reset_time}"
             )
+        return delay
+
+    def _collect_metrics(self, registry: MetricsRegistry) -> None:
+        """Export state kept elsewhere (rate-limit budget, caches, breakers) at scrape time."""
+        remaining = registry.gauge("github_rate_limit_remaining", "Remaining core rate-limit budget per credential")
+        limit = registry.gauge("github_rate_limit_limit", "Core rate limit per credential")
+        reset = registry.gauge("github_rate_limit_reset_seconds", "Seconds until the rate-limit window resets")
+        for status in self.credentials.status():
+            remaining.set(status["remaining"], credential=status["name"])
+            limit.set(status["limit"], credential=status["name"])
+            reset.set(max(status["reset_at"] - datetime.now().timestamp(), 0.0), credential=status["name"])
+
+        if self.cache is not None:
+            cache = registry.gauge("github_response_cache", "ETag response cache counters")
+            for name, value in self.cache.stats().items():
+                cache.set(value, stat=name)
+
+        single_flight = registry.gauge("github_single_flight", "Coalesced GET counters")
+        for name, value in self.single_flight.stats().items():
+            single_flight.set(value, stat=name)
+
+        breaker_open = registry.gauge("github_circuit_open", "1 while the host's circuit breaker is not closed")
+        for breaker in self.breakers.values():
+            breaker_open.set(int(breaker.state != "closed"), host=breaker.host)
+
+    def _endpoint_label(self, url: str) -> str:
+        if url.startswith(self.base_url):
+            return endpoint_template(url[len(self.base_url):])
+        return "external"
+
+    def _breaker(self, url: str) -> CircuitBreaker:
+        host = httpx.URL(url).host
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(host, self.breaker_threshold, self.breaker_reset_timeout)
+        return breaker
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send through the host's circuit breaker; 5xx responses and network errors count as failures."""
+        breaker = self._breaker(url)
+        breaker.before_request()
+        endpoint = self._endpoint_label(url)
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            breaker.record_failure()
+            self.m_requests.inc(method=method, endpoint=endpoint, status=type(e).__name__)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        finally:
+            self.m_latency.observe(time.perf_counter() - started, method=method, endpoint=endpoint)
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(httpx.HTTPStatusError),
-        reraise=True
-    )
-    async def _get(self, endpoint: str, params: Optional[dict] = None) -> dict:
+        self.m_requests.inc(method=method, endpoint=endpoint, status=response.status_code)
+        self.m_bytes.inc(len(response.content), endpoint=endpoint)
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def _send(self, method: str, url: str, priority: int = BACKGROUND, owner: Optional[str] = None, headers: Optional[dict] = None, **kwargs) -> httpx.Response:
+        for _ in range(MAX_THROTTLED_ATTEMPTS):
+            credential = self.credentials.select(owner)
+            await credential.refresh_if_needed()
+            await credential.scheduler.acquire(priority)
+
+            request_headers = {**(headers or {}), "Authorization": credential.authorization}
+            response = await self._request(method, url, headers=request_headers, **kwargs)
+            if not self._check_rate_limit(response, credential):
+                if response.status_code == 304:
+                    credential.scheduler.refund()
+                return response
+            self.m_throttled.inc(credential=credential.name)
+        raise RateLimitError(f"GitHub API kept throttling {method} {url}")
+
+    async def _get(self, endpoint: str, params: Optional[dict] = None, priority: int = BACKGROUND) -> dict:
+        """
+        GET with identical concurrent requests coalesced into a single call.
+
+        The returned body is shared with other single-flight callers and the
+        ETag cache, so it is read-only: a caller that needs to change part of it
+        copies that part first.
+        """
+        key = ResponseCache.make_key(endpoint, params)
+        return await self.single_flight.do(key, lambda: self._fetch(endpoint, params, priority))
+
+    @retry_policy(before_sleep=_count_retry)
+    async def _fetch(self, endpoint: str, params: Optional[dict] = None, priority: int = BACKGROUND) -> dict:
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=self.headers,
-                params=params,
-                timeout=30.0
-            )
-            self._check_rate_limit(response)
-            
-            if response.status_code == 404:
-                raise ValueError(f"Resource not found: {endpoint}")
-            elif response.status_code == 403:
-                raise RateLimitError("Access forbidden or rate limit exceeded")
-            
-            response.raise_for_status()
-            return response.json()
+        key = self.cache.make_key(endpoint, params) if self.cache is not None else None
+        conditional = self.cache.conditional_headers(key) if key else {}
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(httpx.HTTPStatusError),
-        reraise=True
-    )
-    async def _post(self, endpoint: str, json_data: Optional[dict] = None) -> dict:
+        owner = self._owner_from_endpoint(endpoint)
+
+        response = await self._send("GET", url, priority, owner, params=params, headers=conditional)
+
+        if response.status_code == 304:
+            cached = self.cache.hit(key) if key else None
+            if cached is not None:
+                return cached
+            response = await self._send("GET", url, priority, owner, params=params)
+        
+        if response.status_code == 404:
+            raise ValueError(f"Resource not found: {endpoint}")
+        elif response.status_code == 403:
+            raise RateLimitError("Access forbidden or rate limit exceeded")
+        
+        response.raise_for_status()
+        data = _json_loads(response.content)
+        if key:
+            self.cache.store(key, response.headers, data)
+        return data
+
+    @retry_policy(idempotent=False, before_sleep=_count_retry)
+    async def _post(self, endpoint: str, json_data: Optional[dict] = None, priority: int = INTERACTIVE) -> dict:
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                headers=self.headers,
-                json=json_data,
-                timeout=30.0
-            )
-            self._check_rate_limit(response)
-            response.raise_for_status()
-            
-            if response.status_code == 204:
-                return {}
-            return response.json() if response.content else {}
+        response = await self._send("POST", url, priority, self._owner_from_endpoint(endpoint), json=json_data)
+        response.raise_for_status()
+        
+        if response.status_code == 204:
+            return {}
+        return response.json() if response.content else {}
         
     async def get_repo(self, owner: str, repo: str) -> RepoInfo:
         logger.info(f"Fetching repo: {owner}/{repo}")
         data = await self._get(f"repos/{owner}/{repo}")
         return RepoInfo(**data)
 
-    async def get_workflow_runs(self,owner:str,repo:str,branch:str="main",status:Optional[str]=None,per_page:int=30,page:int=1)->WorkflowRunsResponse:
-        logger.info(f"Fetching workflow runs: {owner}/{repo}")
+    async def _actions_enabled_repos(self,org:str)->Optional[set]:
+        """
+        Full names of the org repos allowed to run Actions, or None when every
+        repo is (or the token lacks the admin scope to ask).
+        """
+        try:
+            permissions=await self._get(f"orgs/{org}/actions/permissions")
+            enabled=permissions.get("enabled_repositories","all")
+            if enabled=="all":
+                return None
+            if enabled=="none":
+                return set()
+
+            names=set()
+            page=1
+            while True:
+                data=await self._get(f"orgs/{org}/actions/permissions/repositories",params={"per_page":100,"page":page})
+                names.update(repo["full_name"] for repo in data["repositories"])
+                if len(names)>=data["total_count"] or len(data["repositories"])<100:
+                    return names
+                page+=1
+        except (ValueError,RateLimitError) as e:
+            logger.debug(f"Cannot read Actions permissions for {org}: {e}")
+            return None
+
+    async def list_repositories(self,owner:str,pushed_since:Optional[str]=None,include_archived:bool=False)->List[RepoSummary]:
+        """
+        Repositories of an org (or user) worth monitoring.
+
+        Repos are listed most recently pushed first, so paging stops at the
+        first repo last pushed before pushed_since (ISO timestamp). Archived and
+        disabled repos and, for orgs, repos with Actions turned off are skipped.
+        """
+        logger.info(f"Discovering repositories for {owner}")
+        params={"type":"all","sort":"pushed","direction":"desc","per_page":100}
+        endpoint=f"orgs/{owner}/repos"
+        try:
+            first_page=await self._get(endpoint,params={**params,"page":1})
+            actions_enabled=await self._actions_enabled_repos(owner)
+        except ValueError:
+            # not an org
+            endpoint=f"users/{owner}/repos"
+            params["type"]="owner"
+            first_page=await self._get(endpoint,params={**params,"page":1})
+            actions_enabled=None
+
+        repos=[]
+        page,data=1,first_page
+        while True:
+            for item in data:
+                repo=RepoSummary.from_api(item)
+                if pushed_since and (repo.pushed_at or "")<pushed_since:
+                    return repos
+                if repo.disabled or (repo.archived and not include_archived):
+                    continue
+                if actions_enabled is not None and repo.full_name not in actions_enabled:
+                    continue
+                repos.append(repo)
+            if len(data)<params["per_page"]:
+                return repos
+            page+=1
+            data=await self._get(endpoint,params={**params,"page":page})
+
+    @staticmethod
+    def _runs_query(owner:str,repo:str,branch:Optional[str],status:Optional[str],per_page:int,page:int,created:Optional[str],workflow_id:Optional[Union[int,str]])->Tuple[str,dict]:
         params={"per_page":min(per_page,100),"page":page}
         if branch:
             params["branch"]=branch
         if status:
             params["status"]=status
+        if created:
+            params["created"]=created
         
-        data=await self._get(f"repos/{owner}/{repo}/actions/runs",params=params)
+        if workflow_id:
+            endpoint=f"repos/{owner}/{repo}/actions/workflows/{workflow_id}/runs"
+        else:
+            endpoint=f"repos/{owner}/{repo}/actions/runs"
+        return endpoint,params
+
+    async def get_workflow_runs(self,owner:str,repo:str,branch:str="main",status:Optional[str]=None,per_page:int=30,page:int=1,created:Optional[str]=None,workflow_id:Optional[Union[int,str]]=None)->WorkflowRunsResponse:
+        logger.info(f"Fetching workflow runs: {owner}/{repo}")
+        endpoint,params=self._runs_query(owner,repo,branch,status,per_page,page,created,workflow_id)
+        data=await self._get(endpoint,params=params)
         return WorkflowRunsResponse(**data)
 
-    async def get_failed_runs(self,owner:str,repo:str,branch: str="main",limit:Optional[int]=None)->FailedRunsResponse:
-        logger.info(f"Fetching failed runs:{owner}/{repo}")
-        failed_runs=[]
-        page=1
+    async def get_run_records(self,owner:str,repo:str,branch:str="main",status:Optional[str]=None,per_page:int=100,page:int=1,created:Optional[str]=None,workflow_id:Optional[Union[int,str]]=None)->Tuple[int,List[RunRecord]]:
+        """Fast path of get_workflow_runs for bulk polling: returns (total_count, records) without pydantic validation."""
+        logger.debug(f"Fetching workflow run records: {owner}/{repo} page {page}")
+        endpoint,params=self._runs_query(owner,repo,branch,status,per_page,page,created,workflow_id)
+        data=await self._get(endpoint,params=params)
+        from_api=RunRecord.from_api
+        return data["total_count"],[from_api(run) for run in data["workflow_runs"]]
+
+    async def get_failed_runs_fingerprint(self,owner:str,repo:str,branch:Optional[str]="main",workflow_id:Optional[Union[int,str]]=None)->str:
+        """
+        Cheap marker of a repo's failed-run list: total count plus the id,
+        attempt and updated_at of every run on the first page. A re-run of any
+        of those runs changes its attempt and updated_at (and drops it from the
+        list while it is in progress), not just a newly failed run.
+
+        The query is the first page iter_failed_runs asks for, so an unchanged
+        list is answered with a 304 from the ETag cache, which does not count
+        against the rate limit, and a changed one is already cached for the
+        scan that follows.
+        """
+        endpoint,params=self._runs_query(owner,repo,branch,"failure",100,1,None,workflow_id)
+        data=await self._get(endpoint,params=params)
+        runs=";".join(f"{run['id']}.{run.get('run_attempt',1)}@{run['updated_at']}" for run in data["workflow_runs"])
+        return f"{data['total_count']}:{hashlib.sha1(runs.encode()).hexdigest()}"
+
+    async def iter_failed_runs(self,owner:str,repo:str,branch:str="main",limit:Optional[int]=None,max_concurrency:int=4,created_since:Optional[str]=None,workflow_id:Optional[Union[int,str]]=None,created_until:Optional[str]=None)->AsyncIterator[RunRecord]:
+        """
+        Stream failed runs, newest first.
+
+        The first page is fetched on its own to learn total_count; the remaining
+        pages are then requested concurrently (bounded by max_concurrency) and
+        yielded in page order. Filtering uses status=failure server side, so
+        successful runs are never transferred. Breaking out of the iteration
+        cancels any page requests still in flight.
+
+        created_since and created_until restrict the query to runs created at
+        or after / at or before the given ISO timestamps (incremental sync).
+        """
         per_page=100
+        yielded=0
+        if created_since and created_until:
+            created=f"{created_since}..{created_until}"
+        elif created_since:
+            created=f">={created_since}"
+        elif created_until:
+            created=f"<={created_until}"
+        else:
+            created=None
 
-        while True:
-            response=await self.get_workflow_runs(owner,repo,branch,status="completed",per_page=per_page,page=page)
-            for run in response.workflow_runs:
-                if run.conclusion=="failure":
-                    failed_runs.append(run)
-                    if limit and len(failed_runs)>=limit:
-                        return FailedRunsResponse(
-                            total_count=len(failed_runs),
-                            failed_runs=failed_runs
-                        )
-            if len(response.workflow_runs)<per_page:
-                break
-            page+=1
-        
-        return FailedRunsResponse(total_count=len(failed_runs),failed_runs=failed_runs)
+        async def fetch(page:int)->Tuple[int,List[RunRecord]]:
+            return await self.get_run_records(owner,repo,branch,status="failure",per_page=per_page,page=page,created=created,workflow_id=workflow_id)
+
+        total_count,first_runs=await fetch(1)
+        for run in first_runs:
+            yield run
+            yielded+=1
+            if limit and yielded>=limit:
+                return
+
+        # GitHub returns at most 1000 results for a filtered runs query
+        total=min(total_count,MAX_FILTERED_RUNS)
+        if limit:
+            total=min(total,limit)
+        total_pages=math.ceil(total/per_page)
+        if total_pages<=1 or len(first_runs)<per_page:
+            return
+
+        semaphore=asyncio.Semaphore(max_concurrency)
+
+        async def fetch_page(page:int)->Tuple[int,List[RunRecord]]:
+            async with semaphore:
+                return await fetch(page)
+
+        tasks=[asyncio.create_task(fetch_page(page)) for page in range(2,total_pages+1)]
+        try:
+            for task in tasks:
+                _,runs=await task
+                for run in runs:
+                    yield run
+                    yielded+=1
+                    if limit and yielded>=limit:
+                        return
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def get_failed_runs(self,owner:str,repo:str,branch: str="main",limit:Optional[int]=None)->FailedRunsResponse:
+        logger.info(f"Fetching failed runs:{owner}/{repo}")
+        failed_runs=[
+            WorkflowRun.model_construct(**run.as_dict())
+            async for run in self.iter_failed_runs(owner,repo,branch,limit=limit)
+        ]
+        return FailedRunsResponse.model_construct(total_count=len(failed_runs),failed_runs=failed_runs)
     
+    @retry_policy(before_sleep=_count_retry)
     async def get_run_logs(self,owner:str,repo:str,run_id:int)->LogsResponse:
         logger.info(f"Fetching logs for run {run_id}")
         endpoint=f"repos/{owner}/{repo}/actions/runs/{run_id}/logs"
         url=f"{self.base_url}/{endpoint}"
 
-        async with httpx.AsyncClient() as client:
-            response=await client.get(url,headers=self.headers,follow_redirects=False,timeout=30.0)
-            if response.status_code==302:
-                download_url=response.headers.get("Location")
-                return LogsResponse(download_url=download_url,message="Use this URL to download the logs zp file")
-            elif response.status_code==410:
-                return LogsResponse(message="Logs unavailable",error="Logs have expired(logs are only kept for 90 days)")
-            else:
-                response.raise_for_status()
-                return LogsResponse(message="Unexpected response")
+        response=await self._send("GET",url,owner=owner,follow_redirects=False)
+        if response.status_code==302:
+            download_url=response.headers.get("Location")
+            return LogsResponse(download_url=download_url,message="Use this URL to download the logs zp file")
+        elif response.status_code==410:
+            return LogsResponse(message="Logs unavailable",error="Logs have expired(logs are only kept for 90 days)")
+        else:
+            response.raise_for_status()
+            return LogsResponse(message="Unexpected response")
     
+    async def download_run_logs(self,owner:str,repo:str,run_id:int,dest_dir:Optional[str]=None,chunk_size:int=LOG_CHUNK_SIZE)->Optional[str]:
+        """Follow the logs redirect and spool the zip archive to disk chunk by chunk. Returns the file path."""
+        logs=await self.get_run_logs(owner,repo,run_id)
+        if logs.error:
+            raise ValueError(logs.error)
+        if not logs.download_url:
+            logger.warning(f"No log archive for run {run_id}: {logs.message}")
+            return None
+
+        fd,path=tempfile.mkstemp(prefix=f"run-{run_id}-",suffix=".zip",dir=dest_dir)
+        try:
+            with os.fdopen(fd,"wb") as f:
+                # signed blob storage URL, the GitHub Authorization header must not be sent
+                async with self.client.stream("GET",logs.download_url) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        f.write(chunk)
+                        self.m_log_bytes.inc(len(chunk), kind="run_archive")
+        except BaseException:
+            os.remove(path)
+            raise
+
+        logger.info(f"Downloaded log archive for run {run_id} ({os.path.getsize(path)} bytes)")
+        return path
+
+    async def iter_run_log_files(self,owner:str,repo:str,run_id:int,dest_dir:Optional[str]=None,steps_only:bool=False)->AsyncIterator[Tuple[str,TextIO]]:
+        """
+        Yield (member name, text stream) for every log file in the run archive.
+
+        The archive is spooled to a temporary file and members are decompressed
+        lazily while the caller reads them, so memory use does not depend on the
+        archive size. The temporary file is removed once iteration ends.
+
+        The archive holds one file per job plus a "<job>/<n>_<step>.txt" file per
+        step with the same content split up; steps_only skips the per-job copies.
+        """
+        path=await self.download_run_logs(owner,repo,run_id,dest_dir=dest_dir)
+        if path is None:
+            return
+
+        try:
+            with zipfile.ZipFile(path) as archive:
+                members=[info for info in archive.infolist() if not info.is_dir()]
+                if steps_only and any("/" in info.filename for info in members):
+                    members=[info for info in members if "/" in info.filename]
+
+                for info in members:
+                    with archive.open(info) as raw:
+                        yield info.filename,io.TextIOWrapper(raw,encoding="utf-8",errors="replace")
+        finally:
+            os.remove(path)
+
+    async def open_run_logs_remote(self,owner:str,repo:str,run_id:int)->RemoteZipReader:
+        """
+        Open the run log archive lazily with HTTP Range requests.
+
+        Only the central directory is fetched here; members are range-read on
+        demand. Raises RangeNotSupportedError if the storage host ignores Range.
+        """
+        logs=await self.get_run_logs(owner,repo,run_id)
+        if logs.error:
+            raise ValueError(logs.error)
+        if not logs.download_url:
+            raise ValueError(f"No log archive for run {run_id}: {logs.message}")
+
+        reader=RemoteZipReader(
+            self.client,
+            logs.download_url,
+            on_transfer=lambda size:self.m_log_bytes.inc(size, kind="run_archive_range")
+        )
+        return await reader.open()
+
+    async def get_run_jobs(self,owner:str,repo:str,run_id:int,filter:str="latest",max_concurrency:int=4)->JobsResponse:
+        logger.info(f"Fetching jobs for run {run_id}")
+        endpoint=f"repos/{owner}/{repo}/actions/runs/{run_id}/jobs"
+        per_page=100
+
+        first=await self._get(endpoint,params={"filter":filter,"per_page":per_page,"page":1})
+        # the page body is shared, extend a copy of its list
+        jobs=list(first["jobs"])
+        total_pages=math.ceil(first["total_count"]/per_page)
+
+        if total_pages>1:
+            semaphore=asyncio.Semaphore(max_concurrency)
+
+            async def fetch_page(page:int)->dict:
+                async with semaphore:
+                    return await self._get(endpoint,params={"filter":filter,"per_page":per_page,"page":page})
+
+            pages=await asyncio.gather(*(fetch_page(page) for page in range(2,total_pages+1)))
+            for data in pages:
+                jobs.extend(data["jobs"])
+
+        return JobsResponse(total_count=first["total_count"],jobs=jobs)
+
+    async def get_failed_jobs(self,owner:str,repo:str,run_id:int)->List[WorkflowJob]:
+        response=await self.get_run_jobs(owner,repo,run_id,filter="latest")
+        return [job for job in response.jobs if job.conclusion=="failure"]
+
+    async def iter_job_log_lines(self,owner:str,repo:str,job_id:int)->AsyncIterator[str]:
+        """Stream a single job's plain-text log line by line."""
+        logger.info(f"Fetching logs for job {job_id}")
+        url=f"{self.base_url}/repos/{owner}/{repo}/actions/jobs/{job_id}/logs"
+
+        response=await self._send("GET",url,owner=owner,follow_redirects=False)
+        if response.status_code==410:
+            raise ValueError("Logs have expired(logs are only kept for 90 days)")
+        if response.status_code!=302:
+            response.raise_for_status()
+            raise ValueError(f"Unexpected response for job {job_id} logs: {response.status_code}")
+
+        async with self.client.stream("GET",response.headers["Location"]) as stream:
+            stream.raise_for_status()
+            async for line in stream.aiter_lines():
+                self.m_log_bytes.inc(len(line) + 1, kind="job_log")
+                yield line
+
+    async def get_job_logs(self,owner:str,repo:str,job_id:int)->str:
+        return "\n".join([line async for line in self.iter_job_log_lines(owner,repo,job_id)])
+
     async def get_run_status(self,owner:str,repo:str,run_id:int)->RunStatus:
         logger.info(f"Fetching status for run {run_id}")
         data=await self._get(f"repos/{owner}/{repo}/actions/runs/{run_id}")
@@ -249,15 +826,33 @@ class GitHubMCP:
     
     async def get_rate_limit(self)->RateLimitStatus:
         logger.info("Fetching rate limit status")
-        data=await self._get("rate_limit")
+        data=await self._get("rate_limit",priority=INTERACTIVE)
         core=data["resources"]["core"]
 
         reset_time=datetime.fromtimestamp(core["reset"])
 
         return RateLimitStatus(limit=core["limit"],remaining=core["remaining"],used=core["used"],reset=reset_time.isoformat(),reset_in_seconds=(reset_time-datetime.now()).total_seconds())
     
+_shared_github: Optional[GitHubMCP] = None
+
+
+def get_github_client() -> GitHubMCP:
+    """Shared GitHubMCP instance used by the MCP tools and the graph nodes."""
+    global _shared_github
+
+    if _shared_github is None:
+        _shared_github = GitHubMCP(token=os.getenv("GITHUB_TOKEN"))
+
+    return _shared_github
+
+
+async def close_github_client() -> None:
+    if _shared_github is not None:
+        await _shared_github.aclose()
+
+
 mcp = FastMCP("github-mcp-server")
-github = GitHubMCP(token=os.getenv("GITHUB_TOKEN"))
+github = get_github_client()
 
 
 @mcp.tool()
@@ -265,6 +860,13 @@ async def get_repo(owner: str, repo: str) -> RepoInfo:
     """Get repository information"""
     return await github.get_repo(owner, repo)
 
+@mcp.tool()
+async def get_api_metrics(format: str = "json") -> Union[dict, str]:
+    """GitHub API metrics: per-endpoint request counts and latency percentiles, bytes, retries, cache and rate-limit budget. format is "json" or "prometheus"."""
+    if format == "prometheus":
+        return github.metrics.render_prometheus()
+    return github.metrics.snapshot()
+
 @mcp.tool()
 async def get_workflow_runs(owner:str,repo:str,branch:Optional[str]=None,status:Optional[str]=None,per_page:int=30,page:int=1)->WorkflowRunsResponse:
     return await github.get_workflow_runs(owner,repo,branch,status,per_page,page)
@@ -0,0 +1,183 @@
+import re
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# seconds; GitHub API calls sit between ~50ms and a few seconds
+DEFAULT_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUANTILE_WINDOW = 1024
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_NUMERIC = re.compile(r"^\d+$")
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Collapse an API path into a low-cardinality label:
+    repos/acme/api/actions/runs/123/jobs -> repos/{owner}/{repo}/actions/runs/{id}/jobs
+    """
+    parts = endpoint.strip("/").split("/")
+    if parts and parts[0] == "repos" and len(parts) >= 3:
+        parts[1], parts[2] = "{owner}", "{repo}"
+    elif parts and parts[0] in ("orgs", "users") and len(parts) >= 2:
+        parts[1] = "{owner}"
+    return "/".join("{id}" if _NUMERIC.match(part) else part for part in parts)
+
+
+def _key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in key)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(key, escaped)) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels) -> None:
+        key = _key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def samples(self) -> Iterable[Tuple[str, LabelKey, float]]:
+        for key, value in self.values.items():
+            yield self.name, key, value
+
+    def snapshot(self) -> List[dict]:
+        return [{"labels": dict(key), "value": value} for key, value in self.values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self.values[_key(labels)] = value
+
+
+class Histogram:
+    """
+    Cumulative buckets for Prometheus plus a window of the most recent
+    observations per label set, from which p50/p95/p99 are computed.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    "counts": [0] * len(self.buckets),
+                    "count": 0,
+                    "sum": 0.0,
+                    "recent": deque(maxlen=QUANTILE_WINDOW)
+                }
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["count"] += 1
+            series["sum"] += value
+            series["recent"].append(value)
+
+    @staticmethod
+    def _quantile(ordered: List[float], q: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def samples(self) -> Iterable[Tuple[str, LabelKey, float]]:
+        for key, series in self._series.items():
+            for bound, count in zip(self.buckets, series["counts"]):
+                yield f"{self.name}_bucket", key + (("le", repr(bound)),), count
+            yield f"{self.name}_bucket", key + (("le", "+Inf"),), series["count"]
+            yield f"{self.name}_sum", key, series["sum"]
+            yield f"{self.name}_count", key, series["count"]
+
+    def snapshot(self) -> List[dict]:
+        result = []
+        for key, series in self._series.items():
+            ordered = sorted(series["recent"])
+            result.append({
+                "labels": dict(key),
+                "count": series["count"],
+                "sum": round(series["sum"], 6),
+                "p50": round(self._quantile(ordered, 0.50), 6),
+                "p95": round(self._quantile(ordered, 0.95), 6),
+                "p99": round(self._quantile(ordered, 0.99), 6)
+            })
+        return result
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics registry (counters, gauges, histograms).
+
+    Collectors registered with add_collector run before every export and are
+    used for values that already live elsewhere (cache stats, rate-limit
+    budget) so they are read at export time instead of being pushed.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[["MetricsRegistry"], None]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, **kwargs)
+            return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get_or_create(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, buckets=buckets)
+
+    def add_collector(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        self._collectors.append(collector)
+
+    def collect(self) -> List[object]:
+        for collector in self._collectors:
+            collector(self)
+        return list(self._metrics.values())
+
+    def snapshot(self) -> dict:
+        """JSON-serialisable view, histograms summarised as count/sum/p50/p95/p99."""
+        return {
+            metric.name: {"type": metric.kind, "help": metric.help, "series": metric.snapshot()}
+            for metric in self.collect()
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, key, value in metric.samples():
+                lines.append(f"{name}{_format_labels(key)} {value if isinstance(value, int) else repr(float(value))}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger("RateLimitScheduler")
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+SECONDARY_LIMIT_BACKOFF = 60.0
+
+
+class RateLimitError(Exception):
+    """Raised when GitHub API rate limit is exceeded"""
+    pass
+
+
+class RateLimitScheduler:
+    """
+    Token bucket fed by GitHub's X-RateLimit-* response headers.
+
+    The bucket refills at (remaining - reserve) / seconds-until-reset, so
+    background traffic is spread over the whole rate-limit window instead of
+    bursting through the budget and stalling until the reset. Interactive calls
+    (e.g. workflow reruns) skip the pacing and may dip into the reserve; they
+    only wait while GitHub has explicitly told us to back off.
+
+    Pacing starts with the first response carrying X-RateLimit headers; until
+    then the budget is unknown (GitHub Enterprise Server with rate limiting
+    disabled never sends them) and only explicit back-off is honoured.
+    """
+
+    def __init__(self, limit: int = 5000, burst: int = 200, reserve: int = 100, max_wait: float = 900.0):
+        self.limit = limit
+        self.remaining = limit
+        self.reset_at = time.time() + 3600
+        self.burst = burst
+        self.reserve = reserve
+        self.max_wait = max_wait
+
+        self.tokens = float(burst)
+        self.headers_seen = False
+        self.blocked_until = 0.0
+        self._refilled_at = time.time()
+
+    @property
+    def refill_rate(self) -> float:
+        window = max(self.reset_at - time.time(), 1.0)
+        return max(self.remaining - self.reserve, 0) / window
+
+    def _refill(self, now: float) -> None:
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + 3600
+
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled_at) * self.refill_rate)
+        self._refilled_at = now
+
+    def _wait_time(self, now: float, priority: int) -> float:
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        if not self.headers_seen:
+            return 0.0
+
+        self._refill(now)
+
+        if priority == INTERACTIVE:
+            return 0.0 if self.remaining > 0 else self.reset_at - now
+
+        if self.remaining <= self.reserve:
+            return self.reset_at - now
+        if self.tokens < 1:
+            rate = self.refill_rate
+            return (1 - self.tokens) / rate if rate > 0 else self.reset_at - now
+        return 0.0
+
+    async def acquire(self, priority: int = BACKGROUND) -> None:
+        while True:
+            now = time.time()
+            wait = self._wait_time(now, priority)
+            if wait <= 0:
+                self.tokens -= 1
+                self.remaining -= 1
+                return
+
+            if wait > self.max_wait:
+                raise RateLimitError(
+                    f"GitHub API rate limit exhausted. Resets in {wait:.0f}s"
+                )
+            logger.debug(f"Throttling request for {wait:.2f}s (priority={priority})")
+            await asyncio.sleep(wait)
+
+    def refund(self) -> None:
+        """Return a token for a request GitHub did not bill (e.g. 304 Not Modified)."""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    def update(self, response: httpx.Response) -> float:
+        """
+        Sync the bucket with the response headers.
+
+        Returns how long to back off before retrying when the response was a
+        primary or secondary rate-limit rejection, otherwise 0.
+        """
+        headers = response.headers
+        now = time.time()
+
+        if "X-RateLimit-Remaining" in headers:
+            if not self.headers_seen:
+                # the assumed budget was never paced against; start from a full bucket
+                self.headers_seen = True
+                self.tokens = float(self.burst)
+                self._refilled_at = now
+            self.remaining = int(headers["X-RateLimit-Remaining"])
+            self.limit = int(headers.get("X-RateLimit-Limit", self.limit))
+            self.reset_at = float(headers.get("X-RateLimit-Reset", self.reset_at))
+
+        if response.status_code not in (403, 429):
+            return 0.0
+
+        retry_after: Optional[str] = headers.get("Retry-After")
+        if retry_after:
+            delay = float(retry_after)
+        elif "X-RateLimit-Remaining" in headers and self.remaining == 0:
+            delay = max(self.reset_at - now, 1.0)
+        elif response.status_code == 429 or "secondary rate limit" in response.text.lower():
+            delay = SECONDARY_LIMIT_BACKOFF
+        else:
+            return 0.0
+
+        self.blocked_until = max(self.blocked_until, now + delay)
+        logger.warning(f"GitHub rate limit hit (status {response.status_code}), backing off {delay:.0f}s")
+        return delay
+
+    def status(self) -> dict:
+        return {
+            "headers_seen": self.headers_seen,
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_at": self.reset_at,
+            "tokens": round(self.tokens, 2),
+            "refill_rate": round(self.refill_rate, 3),
+            "blocked_for": max(self.blocked_until - time.time(), 0.0)
+        }
@@ -0,0 +1,201 @@
+import logging
+import struct
+import zlib
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger("RemoteZip")
+
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+ZIP64_EOCD_STRUCT = struct.Struct("<4sQ2H2L4Q")
+CENTRAL_SIGNATURE = b"PK\x01\x02"
+CENTRAL_STRUCT = struct.Struct("<4s6H3L5H2L")
+LOCAL_SIGNATURE = b"PK\x03\x04"
+LOCAL_STRUCT = struct.Struct("<4s5H3L2H")
+
+ZIP64_EXTRA_ID = 0x0001
+UTF8_FLAG = 0x800
+STORED = 0
+DEFLATED = 8
+
+# local headers usually carry the same extra fields as the central record,
+# read a little more so the data normally arrives in the same request
+LOCAL_HEADER_SLACK = 128
+
+
+class RangeNotSupportedError(Exception):
+    """Raised when the log storage host ignores HTTP Range requests"""
+    pass
+
+
+class RemoteZipMember:
+    __slots__ = ("name", "method", "flags", "compressed_size", "file_size", "header_offset", "extra_len")
+
+    def __init__(self, name: str, method: int, flags: int, compressed_size: int, file_size: int, header_offset: int, extra_len: int):
+        self.name = name
+        self.method = method
+        self.flags = flags
+        self.compressed_size = compressed_size
+        self.file_size = file_size
+        self.header_offset = header_offset
+        self.extra_len = extra_len
+
+
+class RemoteZipReader:
+    """
+    Lazy reader for a zip archive behind a Range-capable URL.
+
+    open() fetches only the end of the file to locate and parse the central
+    directory; read() then range-reads the local header and compressed data of
+    a single member. A 40 KB step log can be read out of a 200 MB run archive
+    while transferring little more than the central directory and that member.
+
+    on_transfer, if given, is called with the size of every range read, for
+    download metrics.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, url: str, tail_size: int = 64 * 1024, on_transfer: Optional[Callable[[int], None]] = None):
+        self.client = client
+        self.url = url
+        self.tail_size = tail_size
+        self.on_transfer = on_transfer
+        self.size: Optional[int] = None
+        self.members: Dict[str, RemoteZipMember] = {}
+        self.bytes_transferred = 0
+        self.requests = 0
+
+    async def _range(self, start: int, end: Optional[int] = None) -> httpx.Response:
+        value = f"bytes={start}-{end}" if end is not None else f"bytes={start}"
+        # streamed so a host ignoring Range (200 with the whole archive) is hung up on before the body is read
+        async with self.client.stream("GET", self.url, headers={"Range": value}) as response:
+            self.requests += 1
+            if response.status_code != 206:
+                response.raise_for_status()
+                raise RangeNotSupportedError(f"Range request answered with {response.status_code}")
+            await response.aread()
+
+        self.bytes_transferred += len(response.content)
+        if self.on_transfer is not None:
+            self.on_transfer(len(response.content))
+        return response
+
+    async def _read(self, start: int, length: int) -> bytes:
+        response = await self._range(start, start + length - 1)
+        return response.content
+
+    async def open(self) -> "RemoteZipReader":
+        response = await self._range(-self.tail_size)
+        tail = response.content
+
+        content_range = response.headers.get("Content-Range", "")
+        if "/" not in content_range:
+            raise RangeNotSupportedError("Missing Content-Range header")
+        self.size = int(content_range.rsplit("/", 1)[1])
+        tail_start = self.size - len(tail)
+
+        eocd_pos = tail.rfind(EOCD_SIGNATURE)
+        if eocd_pos < 0:
+            raise ValueError("End of central directory not found, archive comment too long or not a zip")
+        _, _, _, _, total_entries, cd_size, cd_offset, _ = EOCD_STRUCT.unpack_from(tail, eocd_pos)
+
+        if cd_offset == 0xFFFFFFFF or cd_size == 0xFFFFFFFF or total_entries == 0xFFFF:
+            locator_pos = eocd_pos - ZIP64_LOCATOR_STRUCT.size
+            _, _, zip64_offset, _ = ZIP64_LOCATOR_STRUCT.unpack_from(tail, locator_pos)
+            if zip64_offset >= tail_start:
+                zip64_eocd = tail[zip64_offset - tail_start:]
+            else:
+                zip64_eocd = await self._read(zip64_offset, ZIP64_EOCD_STRUCT.size)
+            fields = ZIP64_EOCD_STRUCT.unpack_from(zip64_eocd, 0)
+            cd_size, cd_offset = fields[8], fields[9]
+
+        if cd_offset >= tail_start:
+            directory = tail[cd_offset - tail_start:cd_offset - tail_start + cd_size]
+        else:
+            directory = await self._read(cd_offset, cd_size)
+
+        self._parse_directory(directory)
+        logger.info(
+            f"Opened remote zip with {len(self.members)} members "
+            f"({self.bytes_transferred} of {self.size} bytes fetched)"
+        )
+        return self
+
+    def _parse_directory(self, directory: bytes) -> None:
+        pos = 0
+        while pos + CENTRAL_STRUCT.size <= len(directory):
+            fields = CENTRAL_STRUCT.unpack_from(directory, pos)
+            if fields[0] != CENTRAL_SIGNATURE:
+                break
+
+            flags, method = fields[3], fields[4]
+            compressed_size, file_size = fields[8], fields[9]
+            name_len, extra_len, comment_len = fields[10], fields[11], fields[12]
+            header_offset = fields[16]
+
+            start = pos + CENTRAL_STRUCT.size
+            raw_name = directory[start:start + name_len]
+            extra = directory[start + name_len:start + name_len + extra_len]
+            name = raw_name.decode("utf-8" if flags & UTF8_FLAG else "cp437")
+
+            if 0xFFFFFFFF in (compressed_size, file_size, header_offset):
+                file_size, compressed_size, header_offset = self._parse_zip64_extra(
+                    extra, file_size, compressed_size, header_offset
+                )
+
+            if not name.endswith("/"):
+                self.members[name] = RemoteZipMember(
+                    name, method, flags, compressed_size, file_size, header_offset, extra_len
+                )
+            pos = start + name_len + extra_len + comment_len
+
+    @staticmethod
+    def _parse_zip64_extra(extra: bytes, file_size: int, compressed_size: int, header_offset: int):
+        pos = 0
+        while pos + 4 <= len(extra):
+            header_id, size = struct.unpack_from("<2H", extra, pos)
+            if header_id == ZIP64_EXTRA_ID:
+                values = iter(struct.unpack_from(f"<{size // 8}Q", extra, pos + 4))
+                if file_size == 0xFFFFFFFF:
+                    file_size = next(values)
+                if compressed_size == 0xFFFFFFFF:
+                    compressed_size = next(values)
+                if header_offset == 0xFFFFFFFF:
+                    header_offset = next(values)
+                break
+            pos += 4 + size
+        return file_size, compressed_size, header_offset
+
+    def namelist(self) -> List[str]:
+        return list(self.members)
+
+    async def read(self, name: str) -> bytes:
+        member = self.members.get(name)
+        if member is None:
+            raise KeyError(f"No member named {name!r} in remote archive")
+
+        guess = LOCAL_STRUCT.size + len(name.encode("utf-8")) + member.extra_len + LOCAL_HEADER_SLACK
+        chunk = await self._read(member.header_offset, guess + member.compressed_size)
+
+        fields = LOCAL_STRUCT.unpack_from(chunk, 0)
+        if fields[0] != LOCAL_SIGNATURE:
+            raise ValueError(f"Bad local header for {name!r}")
+        data_start = LOCAL_STRUCT.size + fields[9] + fields[10]
+        data = chunk[data_start:data_start + member.compressed_size]
+        if len(data) < member.compressed_size:
+            data += await self._read(
+                member.header_offset + data_start + len(data),
+                member.compressed_size - len(data)
+            )
+
+        if member.method == STORED:
+            return data
+        if member.method == DEFLATED:
+            return zlib.decompressobj(-zlib.MAX_WBITS).decompress(data)
+        raise ValueError(f"Unsupported compression method {member.method} for {name!r}")
+
+    async def read_text(self, name: str) -> str:
+        return (await self.read(name)).decode("utf-8", errors="replace")
@@ -0,0 +1,117 @@
+import logging
+import time
+from typing import Callable, Optional
+
+import httpx
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+logger = logging.getLogger("Resilience")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# errors raised before the request reached GitHub, so retrying cannot repeat a side effect
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the host's circuit is open"""
+    pass
+
+
+def is_retryable(exc: BaseException, idempotent: bool = True) -> bool:
+    """
+    Retry 429, 5xx and network errors; never other 4xx or an open circuit.
+
+    For non-idempotent requests only errors raised before the request was sent
+    are retried, since a read timeout may mean GitHub already acted on it. An
+    error status means the request arrived, so it is never retried for them;
+    rate-limit rejections are already waited out by the scheduler in _send.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return idempotent and exc.response.status_code in RETRYABLE_STATUS_CODES
+    if isinstance(exc, httpx.TransportError):
+        return idempotent or isinstance(exc, UNSENT_ERRORS)
+    return False
+
+
+def retry_policy(attempts: int = 3, max_backoff: float = 10.0, idempotent: bool = True, before_sleep: Optional[Callable] = None):
+    """tenacity decorator: classified retries with full-jitter exponential backoff."""
+    return retry(
+        stop=stop_after_attempt(attempts),
+        wait=wait_random_exponential(multiplier=1, max=max_backoff),
+        retry=retry_if_exception(lambda exc: is_retryable(exc, idempotent)),
+        before_sleep=before_sleep,
+        reraise=True
+    )
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After failure_threshold consecutive failures (5xx responses or network
+    errors) the circuit opens and requests fail fast with CircuitOpenError for
+    reset_timeout seconds. Then a single probe request is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+        self.rejected = 0
+
+    def before_request(self) -> None:
+        if self.state == CLOSED:
+            return
+
+        if self.state == OPEN:
+            retry_in = self.opened_at + self.reset_timeout - time.monotonic()
+            if retry_in > 0:
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuit open for {self.host}, retry in {retry_in:.0f}s")
+            self.state = HALF_OPEN
+
+        if self._probing:
+            self.rejected += 1
+            raise CircuitOpenError(f"Circuit half-open for {self.host}, probe in progress")
+        self._probing = True
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info(f"Circuit closed for {self.host}")
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(f"Circuit opened for {self.host} after {self.failures} failures")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Request ended without a verdict (e.g. cancelled); let another probe through."""
+        self._probing = False
+
+    def status(self) -> dict:
+        return {
+            "host": self.host,
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected
+        }
+
@@ -0,0 +1,131 @@
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("ResponseCache")
+
+
+class ResponseCache:
+    """
+    LRU cache of GitHub GET responses keyed by (endpoint, params).
+
+    Stores the ETag / Last-Modified validators together with the parsed body so
+    that a 304 Not Modified answer can be replayed without re-downloading the
+    payload. 304s are not counted against the GitHub rate limit.
+    """
+
+    def __init__(self, max_entries: int = 256, path: Optional[str] = None, autosave_every: int = 50):
+        self.max_entries = max_entries
+        self.path = path
+        self.autosave_every = autosave_every
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._dirty = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[dict] = None) -> str:
+        endpoint = endpoint.lstrip("/")
+        if not params:
+            return endpoint
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{endpoint}?{query}"
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def hit(self, key: str) -> Optional[Any]:
+        """Return the cached body after a 304, or None if it was evicted meanwhile."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry["body"]
+
+    def store(self, key: str, headers, body: Any) -> None:
+        self.misses += 1
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        self._entries[key] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body
+        }
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+        self._dirty += 1
+        if self.path and self._dirty >= self.autosave_every:
+            self.save()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._dirty = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable response cache {self.path}: {e}")
+            return
+
+        for key, entry in data.get("entries", [])[-self.max_entries:]:
+            self._entries[key] = entry
+        logger.info(f"Loaded {len(self._entries)} cached responses from {self.path}")
+
+    def save(self) -> None:
+        if not self.path:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": list(self._entries.items())}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = 0
+        except OSError as e:
+            logger.warning(f"Failed to persist response cache to {self.path}: {e}")
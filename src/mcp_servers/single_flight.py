@@ -0,0 +1,85 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+MAX_RECENT_RESULTS = 1024
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is in flight await the same task and share its result (or
+    exception). With ttl > 0 a finished result is also replayed for ttl
+    seconds. The shared task is shielded, so one caller being cancelled does
+    not cancel the request for the others; once the last caller waiting on it
+    is cancelled (a timeout, say) the task is cancelled too, and that caller
+    returns only after it has stopped, so abandoned work never keeps running
+    outside whatever bounds the callers' concurrency.
+    """
+
+    def __init__(self, ttl: float = 0.0):
+        self.ttl = ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._recent: Dict[str, Tuple[float, Any]] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}
+
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+
+        recent = self._recent.get(key)
+        if recent is not None:
+            if recent[0] > time.monotonic():
+                self.shared += 1
+                return recent[1]
+            del self._recent[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+        else:
+            self.shared += 1
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    if self._inflight.get(key) is task:
+                        del self._inflight[key]
+                    task.cancel()
+                    await asyncio.wait({task})
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # retrieve the outcome so an exception nobody awaited is not logged
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            return
+
+        now = time.monotonic()
+        if len(self._recent) >= MAX_RECENT_RESULTS:
+            self._recent = {k: v for k, v in self._recent.items() if v[0] > now}
+            if len(self._recent) >= MAX_RECENT_RESULTS:
+                del self._recent[next(iter(self._recent))]
+        self._recent[key] = (now + self.ttl, task.result())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "in_flight": len(self._inflight),
+            "ttl": self.ttl
+        }
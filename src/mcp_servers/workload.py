@@ -0,0 +1,230 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+# failure category -> (failed step name, log lines ending the step)
+FAILURE_TEMPLATES = {
+    "test_failure": ("Run tests", [
+        "============================= test session starts ==============================",
+        "collected 214 items",
+        "tests/test_api.py ........F.....",
+        "=================================== FAILURES ===================================",
+        "___________________________ test_create_order_total ___________________________",
+        "    def test_create_order_total():",
+        ">       assert order.total == 42.0",
+        "E       AssertionError: assert 41.99 == 42.0",
+        "tests/test_api.py:88: AssertionError",
+        "=========================== short test summary info ============================",
+        "FAILED tests/test_api.py::test_create_order_total - AssertionError: assert 41.99 == 42.0",
+        "========================= 1 failed, 213 passed in 12.31s =======================",
+        "##[error]Process completed with exit code 1."
+    ]),
+    "dependency_error": ("Install dependencies", [
+        "Collecting requests==2.31.0",
+        "Traceback (most recent call last):",
+        "  File \"/home/runner/work/app/app/setup.py\", line 3, in <module>",
+        "    import numpy",
+        "ModuleNotFoundError: No module named 'numpy'",
+        "##[error]Process completed with exit code 1."
+    ]),
+    "timeout_error": ("Run integration tests", [
+        "Waiting for service postgres to become healthy...",
+        "tests/integration/test_db.py::test_migrations",
+        "Error: The operation was canceled.",
+        "##[error]The job running on runner GitHub Actions 12 has exceeded the maximum execution time of 30 minutes."
+    ]),
+    "network_error": ("Fetch artifacts", [
+        "Downloading https://registry.npmjs.org/left-pad/-/left-pad-1.3.0.tgz",
+        "npm ERR! code ECONNRESET",
+        "npm ERR! network read ECONNRESET",
+        "npm ERR! network This is a problem related to network connectivity.",
+        "##[error]Process completed with exit code 1."
+    ]),
+    "build_error": ("Build", [
+        "> webpack --mode production",
+        "ERROR in ./src/index.ts 14:2",
+        "Module parse failed: Unexpected token (14:2)",
+        "webpack 5.88.2 compiled with 1 error in 8123 ms",
+        "##[error]Process completed with exit code 2."
+    ])
+}
+
+DEFAULT_FAILURE_MIX = {
+    "test_failure": 0.45,
+    "dependency_error": 0.15,
+    "timeout_error": 0.15,
+    "network_error": 0.15,
+    "build_error": 0.10
+}
+
+# categories whose re-run succeeds, like real flaky failures
+FLAKY_CATEGORIES = {"timeout_error", "network_error"}
+
+STEP_NAMES = ["Set up job", "Checkout", "Install dependencies", "Build", "Run tests"]
+
+
+def _iso(ts: datetime) -> str:
+    return ts.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class Workload:
+    """
+    Synthetic GitHub Actions data: repos x runs, each run with jobs and steps,
+    a configurable share of failed runs and a mix of failure categories.
+
+    Everything is generated up front from a seed, so two workloads built with
+    the same arguments are identical. Step logs are generated on demand.
+    """
+
+    def __init__(
+        self,
+        owner: str = "acme",
+        repos: int = 10,
+        runs_per_repo: int = 100,
+        failure_rate: float = 0.2,
+        failure_mix: Optional[Dict[str, float]] = None,
+        jobs_per_run: int = 3,
+        noise_lines: int = 200,
+        seed: int = 0
+    ):
+        self.owner = owner
+        self.failure_mix = failure_mix or DEFAULT_FAILURE_MIX
+        self.noise_lines = noise_lines
+        self.seed = seed
+
+        rng = random.Random(seed)
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        categories = list(self.failure_mix)
+        weights = [self.failure_mix[c] for c in categories]
+
+        self.repos: List[dict] = []
+        self.runs: Dict[str, List[dict]] = {}
+        self.runs_by_id: Dict[int, dict] = {}
+        self.jobs_by_id: Dict[int, dict] = {}
+
+        run_id = 10_000_000
+        job_id = 50_000_000
+        for r in range(repos):
+            name = f"service-{r:03d}"
+            full_name = f"{owner}/{name}"
+            pushed = now - timedelta(hours=r * 6)
+            self.repos.append({
+                "id": 1000 + r,
+                "name": name,
+                "full_name": full_name,
+                "owner": {"login": owner},
+                "private": False,
+                "description": f"Synthetic repository {r}",
+                "default_branch": "main",
+                "archived": r % 25 == 24,
+                "disabled": False,
+                "language": "Python",
+                "stargazers_count": r,
+                "forks_count": 0,
+                "open_issues_count": 0,
+                "created_at": _iso(now - timedelta(days=365)),
+                "updated_at": _iso(pushed),
+                "pushed_at": _iso(pushed),
+                "html_url": f"https://github.com/{full_name}"
+            })
+
+            repo_runs = []
+            for n in range(runs_per_repo):
+                run_id += 1
+                created = pushed - timedelta(minutes=30 * n)
+                failed = rng.random() < failure_rate
+                category = rng.choices(categories, weights)[0] if failed else None
+                run = {
+                    "id": run_id,
+                    "name": "CI",
+                    "workflow_id": 1,
+                    "run_number": runs_per_repo - n,
+                    "run_attempt": 1,
+                    "event": "push",
+                    "head_branch": "main" if n % 5 else "feature/x",
+                    "head_sha": f"{rng.getrandbits(160):040x}",
+                    "status": "completed",
+                    "conclusion": "failure" if failed else "success",
+                    "created_at": _iso(created),
+                    "updated_at": _iso(created + timedelta(minutes=7)),
+                    "run_started_at": _iso(created),
+                    "html_url": f"https://github.com/{full_name}/actions/runs/{run_id}",
+                    "repository": {"full_name": full_name},
+                    "_repo": full_name,
+                    "_category": category,
+                    "_job_ids": []
+                }
+
+                failing_job = rng.randrange(jobs_per_run) if failed else -1
+                for j in range(jobs_per_run):
+                    job_id += 1
+                    job_failed = j == failing_job
+                    steps = [
+                        {"name": step, "number": s + 1, "status": "completed", "conclusion": "success"}
+                        for s, step in enumerate(STEP_NAMES)
+                    ]
+                    if job_failed:
+                        failed_step = FAILURE_TEMPLATES[category][0]
+                        steps.append({"name": failed_step, "number": len(steps) + 1, "status": "completed", "conclusion": "failure"})
+                    job = {
+                        "id": job_id,
+                        "run_id": run_id,
+                        "run_attempt": 1,
+                        "name": f"test (py3.{10 + j})",
+                        "status": "completed",
+                        "conclusion": "failure" if job_failed else "success",
+                        "started_at": run["run_started_at"],
+                        "completed_at": run["updated_at"],
+                        "steps": steps,
+                        "html_url": f"https://github.com/{full_name}/actions/runs/{run_id}/job/{job_id}",
+                        "_category": category if job_failed else None
+                    }
+                    self.jobs_by_id[job_id] = job
+                    run["_job_ids"].append(job_id)
+
+                repo_runs.append(run)
+                self.runs_by_id[run_id] = run
+            self.runs[full_name] = repo_runs
+
+    @property
+    def total_runs(self) -> int:
+        return len(self.runs_by_id)
+
+    @property
+    def failed_runs(self) -> int:
+        return sum(1 for run in self.runs_by_id.values() if run["conclusion"] == "failure")
+
+    def step_log(self, job: dict, step: dict) -> str:
+        """Deterministic log text of one step; failed steps end in their category's error."""
+        rng = random.Random(f"{self.seed}:{job['id']}:{step['number']}")
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        lines = [
+            f"{_iso(base + timedelta(seconds=i))} [{step['name']}] processing item {rng.getrandbits(32):08x} ok"
+            for i in range(self.noise_lines)
+        ]
+        if step["conclusion"] == "failure":
+            lines.extend(FAILURE_TEMPLATES[job["_category"]][1])
+        return "\n".join(lines) + "\n"
+
+    def job_log(self, job: dict) -> str:
+        return "".join(self.step_log(job, step) for step in job["steps"])
+
+    def rerun(self, run_id: int, failed_jobs_only: bool = False) -> dict:
+        """Start a new attempt; flaky categories pass on retry, the rest fail again."""
+        run = self.runs_by_id[run_id]
+        run["run_attempt"] += 1
+        run["updated_at"] = _iso(datetime.now(timezone.utc))
+        if run["_category"] in FLAKY_CATEGORIES:
+            run["conclusion"] = "success"
+            for job_id in run["_job_ids"]:
+                job = self.jobs_by_id[job_id]
+                job["conclusion"] = "success"
+                job["steps"] = [dict(step, conclusion="success") for step in job["steps"]]
+        for job_id in run["_job_ids"]:
+            self.jobs_by_id[job_id]["run_attempt"] = run["run_attempt"]
+        return run
+
+
+def public(record: dict) -> dict:
+    """API view of a workload record (drops the generator's private keys)."""
+    return {key: value for key, value in record.items() if not key.startswith("_")}